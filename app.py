@@ -1,7 +1,18 @@
 import streamlit as st
 import pandas as pd
-import io
-from src.generation_openai import generate_report
+import os
+import time
+import numpy as np
+from src.config import CATEGORY_MAP
+from src.ranking import (
+    build_ranking_stats,
+    build_recency_stats,
+    default_ranking_params,
+    rerank
+)
+from src.report_pdf import ranking_rows, render_report_pdf
+from src.review_search import open_index, search_reviews, count_matches, product_reviews
+from src.windowed_metrics import WindowedMetrics
 
 # -----------------------------
 # Page Configuration
@@ -19,8 +30,9 @@ st.markdown(
 
 1. Select a product category.
 2. Review the top-ranked products based on sentiment-adjusted scoring.
-3. Click **Generate Executive Report** for AI-powered analysis.
-4. Download the report as a professional PDF.
+3. Search individual reviews or drill into a single product.
+4. Click **Generate Executive Report** for AI-powered analysis.
+5. Download the report as a professional PDF.
 
 This system combines sentiment modeling, clustering, Bayesian ranking,
 and generative AI to deliver structured product intelligence.
@@ -62,15 +74,87 @@ if missing_columns:
 # -----------------------------
 # Human-Friendly Category Names
 # -----------------------------
-CATEGORY_MAP = {
-    0: "Portable Bluetooth Speakers",
-    1: "Car Audio & Radio Devices",
-    2: "Home / TV Speaker Systems",
-    3: "Headphones & Earbuds",
-    4: "Smart Speakers (Alexa / Echo)"
+df["Category Name"] = df["cluster"].map(CATEGORY_MAP)
+
+# -----------------------------
+# What-If Ranking Controls
+# -----------------------------
+WINDOW_METRICS_PATH = "data/processed/window_metrics.npz"
+
+st.sidebar.header("What-If Ranking")
+
+use_recency = False
+if os.path.exists(WINDOW_METRICS_PATH):
+    use_recency = st.sidebar.checkbox("Weight recent reviews more")
+
+if use_recency:
+    half_life_days = st.sidebar.slider(
+        "Recency half-life (days)",
+        min_value=30,
+        max_value=1095,
+        value=365,
+        step=30
+    )
+    with np.load(WINDOW_METRICS_PATH) as arrays:
+        window_metrics = WindowedMetrics.from_arrays(dict(arrays))
+    ranking_stats = build_recency_stats(df, window_metrics, half_life_days)
+else:
+    ranking_stats = build_ranking_stats(df)
+
+ranking_defaults = default_ranking_params(ranking_stats)
+
+scoring_labels = {
+    "bayesian": "Bayesian rating × sentiment penalty",
+    "wilson": "Wilson lower bound (positive share)",
+    "beta": "Beta posterior quantile (positive share)",
 }
 
-df["Category Name"] = df["cluster"].map(CATEGORY_MAP)
+scoring_method = st.sidebar.selectbox(
+    "Scoring method",
+    list(scoring_labels.keys()),
+    format_func=scoring_labels.get
+)
+
+if scoring_method == "bayesian":
+    prior_strength = st.sidebar.slider(
+        "Prior strength (pseudo-reviews)",
+        min_value=0.0,
+        max_value=float(max(50, ranking_stats["count"].max())),
+        value=ranking_defaults["prior_strength"],
+        step=1.0
+    )
+    prior_mean = st.sidebar.slider(
+        "Prior mean rating",
+        min_value=1.0,
+        max_value=5.0,
+        value=round(ranking_defaults["prior_mean"], 2),
+        step=0.05
+    )
+    penalty_weight = st.sidebar.slider(
+        "Negative-review penalty weight",
+        min_value=0.0,
+        max_value=2.0,
+        value=1.0,
+        step=0.05
+    )
+    confidence = None
+else:
+    prior_strength = prior_mean = penalty_weight = None
+    confidence = st.sidebar.select_slider(
+        "Confidence level",
+        options=[0.80, 0.90, 0.95, 0.99],
+        value=0.95
+    )
+
+df = rerank(
+    df,
+    ranking_stats,
+    method=scoring_method,
+    prior_strength=prior_strength,
+    prior_mean=prior_mean,
+    penalty_weight=penalty_weight,
+    confidence=confidence
+)
 
 # -----------------------------
 # Category Selection
@@ -120,8 +204,18 @@ display_columns = {
     "avg_rating": "Avg Rating",
     "review_count": "Reviews",
     "negative_ratio": "Negative Ratio",
+    "score_interval": "Score 90% CI",
+    "p_rank1": "P(#1 in Category)",
 }
 
+# Bootstrap intervals come from the pipeline's default
+# Bayesian scoring (see src/uncertainty.py).
+if {"score_low", "score_high"}.issubset(top_products.columns):
+    top_products["score_interval"] = (
+        top_products["score_low"].round(2).astype(str) + " – " +
+        top_products["score_high"].round(2).astype(str)
+    )
+
 available_columns = [
     col for col in display_columns.keys()
     if col in top_products.columns
@@ -133,27 +227,170 @@ display_df = top_products[available_columns].rename(
 
 st.dataframe(display_df, use_container_width=True)
 
+if "score_interval" in top_products.columns:
+    st.caption(
+        "Score 90% CI and P(#1 in Category) are bootstrap estimates "
+        "for the default Bayesian scoring; products with few reviews "
+        "have wide intervals."
+    )
+
+# -----------------------------
+# Review Search (SQLite FTS5)
+# -----------------------------
+REVIEW_INDEX_PATH = "data/processed/review_index.db"
+
+
+@st.cache_resource
+def load_review_index(path, modified):
+    # Keyed on mtime so a rebuilt index is picked up.
+    return open_index(path)
+
+
+def show_review_hits(results, total, elapsed_ms):
+    st.caption(
+        f"Top {len(results)} of {total:,} matching reviews "
+        f"in {elapsed_ms:.1f} ms (BM25)"
+    )
+
+    for _, row in results.iterrows():
+        st.markdown(
+            f"**{row['asin']}** · {row['rating']:.0f}★ · {row['sentiment']}  \n"
+            f"{row['snippet']}"
+        )
+
+
+st.subheader("Review Search")
+
+if not os.path.exists(REVIEW_INDEX_PATH):
+    st.info("Review search index not built yet. Run `python -m src.cli index`.")
+else:
+    review_index = load_review_index(
+        REVIEW_INDEX_PATH,
+        os.path.getmtime(REVIEW_INDEX_PATH)
+    )
+
+    search_col, scope_col, sentiment_col = st.columns([3, 1, 1])
+
+    search_query = search_col.text_input(
+        "Search reviews",
+        placeholder='battery drain, "sound quality", bluetooth conn*'
+    )
+    search_scope = scope_col.selectbox("Scope", ["This category", "All categories"])
+    sentiment_filter = sentiment_col.selectbox("Sentiment", ["All", "positive", "negative"])
+    sentiment_filter = None if sentiment_filter == "All" else sentiment_filter
+
+    if search_query:
+        search_filters = dict(
+            cluster=cluster_id if search_scope == "This category" else None,
+            sentiment=sentiment_filter
+        )
+
+        start = time.perf_counter()
+        results = search_reviews(review_index, search_query, **search_filters)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        show_review_hits(
+            results,
+            count_matches(review_index, search_query, **search_filters),
+            elapsed_ms
+        )
+
+    # -----------------------------
+    # Product Drill-Down
+    # -----------------------------
+    st.subheader("Product Drill-Down")
+
+    drill_products = cluster_df.sort_values("cluster_rank").head(50)
+    drill_labels = dict(zip(drill_products["asin"], drill_products["asin"]))
+    if "title" in drill_products.columns:
+        drill_labels = {
+            asin: f"{title} ({asin})"
+            for asin, title in zip(drill_products["asin"], drill_products["title"])
+        }
+
+    drill_asin = st.selectbox(
+        "Product",
+        list(drill_labels.keys()),
+        format_func=drill_labels.get
+    )
+    drill_query = st.text_input("Search this product's reviews", key="drill_query")
+
+    start = time.perf_counter()
+    if drill_query:
+        results = search_reviews(
+            review_index,
+            drill_query,
+            asin=drill_asin,
+            sentiment=sentiment_filter
+        )
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        show_review_hits(
+            results,
+            count_matches(review_index, drill_query, asin=drill_asin, sentiment=sentiment_filter),
+            elapsed_ms
+        )
+    else:
+        recent = product_reviews(review_index, drill_asin, sentiment=sentiment_filter)
+        st.caption(
+            f"{len(recent)} most recent reviews in "
+            f"{(time.perf_counter() - start) * 1000:.1f} ms"
+        )
+        st.dataframe(
+            recent[["rating", "sentiment", "title", "text"]],
+            use_container_width=True
+        )
+
 # -----------------------------
 # Generate Executive Report
 # -----------------------------
 st.subheader("AI Executive Report")
 
+EVIDENCE_PATH = "data/processed/product_evidence.csv"
+
+# Pre-rendered by the pipeline's pdf stage: served as-is.
+prerendered_pdf = f"data/processed/report_cluster_{cluster_id}.pdf"
+
+if os.path.exists(prerendered_pdf):
+    with open(prerendered_pdf, "rb") as f:
+        st.download_button(
+            label="Download Latest Report as PDF",
+            data=f.read(),
+            file_name=f"{selected_category}_Report.pdf",
+            mime="application/pdf",
+            key="prerendered_pdf"
+        )
+    st.caption("Pre-rendered from the pipeline's latest generated report.")
+
 if st.button("Generate Executive Report"):
     with st.spinner("Generating AI-powered report..."):
         try:
-            report_text = generate_report(cluster_id, cluster_df)
+            # Imported on demand: the OpenAI client is only
+            # needed once a report is requested.
+            from src.generation_openai import generate_report
+
+            # Selected review sentences ground the report
+            # (built by the pipeline's evidence stage).
+            evidence_df = None
+            if os.path.exists(EVIDENCE_PATH):
+                evidence_df = pd.read_csv(EVIDENCE_PATH)
+
+            report_text = generate_report(cluster_id, cluster_df, evidence_df)
             st.markdown(report_text)
 
-            # PDF Download
-            pdf_buffer = io.BytesIO()
-            pdf_buffer.write(report_text.encode("utf-8"))
-            pdf_buffer.seek(0)
+            # Fresh report: render its PDF on demand
+            pdf_bytes = render_report_pdf(
+                cluster_id,
+                ranking_rows(cluster_df),
+                report_text
+            )
 
             st.download_button(
                 label="Download Report as PDF",
-                data=pdf_buffer,
+                data=pdf_bytes,
                 file_name=f"{selected_category}_Report.pdf",
-                mime="application/pdf"
+                mime="application/pdf",
+                key="fresh_pdf"
             )
 
         except Exception as e:
@@ -0,0 +1,103 @@
+"""
+Import-time budget check for the light CLI commands.
+
+Runs each command's start-up imports in a fresh interpreter
+under ``python -X importtime`` and fails if the total import
+time exceeds the command's budget in ``src.cli.IMPORT_BUDGET_MS``
+or if any heavy ML/API dependency gets imported.
+
+Usage:
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --commands rank --budget-ms 800
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+from src.cli import HEAVY_MODULES, IMPORT_BUDGET_MS, LIGHT_COMMANDS
+
+
+def measure(command: str) -> dict:
+    """
+    Import-time profile of one command's start-up.
+    """
+
+    code = f"import src.cli as cli; cli.load_command_modules({command!r})"
+
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+    total_us = 0
+    modules = []
+
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+
+        if not self_us.strip().isdigit():
+            continue  # header row
+
+        total_us += int(self_us)
+        modules.append((name.strip(), int(cumulative_us)))
+
+    heavy = sorted({
+        name
+        for name, _ in modules
+        if name.split(".")[0] in HEAVY_MODULES
+    })
+
+    slowest = sorted(modules, key=lambda item: item[1], reverse=True)[:5]
+
+    return {"total_ms": total_us / 1000, "heavy": heavy, "slowest": slowest}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--commands", nargs="+", default=list(LIGHT_COMMANDS))
+    parser.add_argument("--budget-ms", type=float, help="Override every budget.")
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Take the median of this many cold starts."
+    )
+    args = parser.parse_args(argv)
+
+    failures = []
+
+    for command in args.commands:
+        runs = [measure(command) for _ in range(args.repeat)]
+        total_ms = statistics.median(run["total_ms"] for run in runs)
+        heavy = runs[0]["heavy"]
+        budget = args.budget_ms or IMPORT_BUDGET_MS.get(command)
+
+        status = "ok"
+        if heavy:
+            status = "FAIL (heavy imports)"
+            failures.append(command)
+        elif budget is not None and total_ms > budget:
+            status = "FAIL (over budget)"
+            failures.append(command)
+
+        budget_text = f"{budget:.0f}ms" if budget is not None else "-"
+        print(f"{command:<8} {total_ms:>8.1f}ms  budget {budget_text:>8}  {status}")
+
+        if heavy:
+            print(f"         heavy modules: {', '.join(heavy)}")
+        if status != "ok":
+            for name, cumulative in runs[0]["slowest"]:
+                print(f"         {cumulative / 1000:>8.1f}ms  {name}")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,443 @@
+"""
+Per-stage pipeline benchmarks on a synthetic corpus.
+
+Runs preprocessing filter, sentiment evaluation (stub model),
+aggregation, embedding (stub model), clustering, TF-IDF
+interpretation, review search index, windowed metrics,
+ranking, bootstrap score intervals, review evidence
+selection and report generation (stub client)
+at the requested corpus sizes, fully offline.
+
+Usage:
+    python -m benchmarks.run                       # 10k, 100k
+    python -m benchmarks.run --sizes 10k 100k 1m --repeat 5
+    python -m benchmarks.run --save-baseline       # record baseline
+    python -m benchmarks.run --threshold 0.2       # compare, exit 1 on regression
+
+Results are written to benchmarks/results/; the baseline
+defaults to benchmarks/results/baseline.json.
+"""
+
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import SIZES, generate_reviews, parse_size
+from benchmarks import stubs
+from src import profiling
+
+RESULTS_DIR = "benchmarks/results"
+BASELINE_PATH = f"{RESULTS_DIR}/baseline.json"
+
+DEFAULT_SIZES = ["10k", "100k"]
+DEFAULT_REPEAT = 3
+DEFAULT_THRESHOLD = 0.25
+
+# Timing differences below this are treated as noise.
+NOISE_FLOOR_SECONDS = 0.05
+
+# silhouette_score is O(n²) in the number of products.
+CLUSTER_MAX_PRODUCTS = 50_000
+
+
+class StageUnavailable(Exception):
+    """
+    A stage cannot run here (missing dependency or size cap).
+    """
+
+
+@contextlib.contextmanager
+def patched(module, **attrs):
+    """
+    Temporarily replace module attributes.
+    """
+
+    originals = {name: getattr(module, name) for name in attrs}
+    for name, value in attrs.items():
+        setattr(module, name, value)
+    try:
+        yield
+    finally:
+        for name, value in originals.items():
+            setattr(module, name, value)
+
+
+def _import(module_name: str):
+    try:
+        return importlib.import_module(module_name)
+    except ImportError as e:
+        raise StageUnavailable(f"{module_name}: {e}") from e
+
+
+# =====================================================
+# STAGES
+# =====================================================
+#
+# Each stage takes the shared fixture dict and the scratch
+# directory, returns (rows_processed, outputs_for_later_stages).
+
+def bench_preprocess(ctx, out_dir):
+    preprocessing = _import("src.preprocessing")
+
+    df = preprocessing.filter_audio_reviews(ctx["raw"])
+    df = preprocessing.label_sentiment(df.reset_index(drop=True))
+
+    return len(ctx["raw"]), {"reviews": df}
+
+
+def bench_sentiment(ctx, out_dir):
+    sentiment = _import("src.sentiment")
+    batch_tuning = _import("src.batch_tuning")
+
+    # Stub models: fixed batch sizes, nothing calibrated or persisted
+    with patched(batch_tuning, BATCH_AUTOTUNE=False), patched(
+        sentiment,
+        PROCESSED_DIR=out_dir,
+        load_sentiment_model=stubs.StubSentimentClassifier
+    ):
+        sentiment.evaluate_sentiment_model(ctx["reviews"])
+
+    return min(2000, len(ctx["reviews"])), {}
+
+
+def bench_aggregate(ctx, out_dir):
+    aggregation = _import("src.aggregation")
+
+    with patched(aggregation, PROCESSED_DIR=out_dir):
+        product_df = aggregation.aggregate_products(ctx["reviews"])
+
+    return len(ctx["reviews"]), {"products": product_df}
+
+
+def bench_embed(ctx, out_dir):
+    embeddings_module = _import("src.embeddings")
+    batch_tuning = _import("src.batch_tuning")
+
+    product_df = embeddings_module.filter_products(ctx["products"])
+
+    with patched(batch_tuning, BATCH_AUTOTUNE=False), patched(
+        embeddings_module,
+        PROCESSED_DIR=out_dir,
+        load_embedding_model=stubs.StubEmbeddingModel
+    ):
+        embeddings = embeddings_module.generate_embeddings(product_df)
+
+    return len(product_df), {"filtered": product_df, "embeddings": embeddings}
+
+
+def bench_cluster(ctx, out_dir):
+    clustering = _import("src.clustering")
+
+    if len(ctx["filtered"]) > CLUSTER_MAX_PRODUCTS:
+        raise StageUnavailable(
+            f"{len(ctx['filtered'])} products exceeds "
+            f"CLUSTER_MAX_PRODUCTS={CLUSTER_MAX_PRODUCTS}"
+        )
+
+    with patched(clustering, PROCESSED_DIR=out_dir):
+        clustered_df = clustering.perform_clustering(
+            ctx["filtered"].copy(),
+            ctx["embeddings"]
+        )
+
+    return len(clustered_df), {"clustered": clustered_df}
+
+
+def bench_interpret(ctx, out_dir):
+    interpretation = _import("src.cluster_interpretation")
+
+    with patched(interpretation, PROCESSED_DIR=out_dir):
+        interpretation.interpret_clusters(ctx["clustered"])
+
+    return len(ctx["clustered"]), {}
+
+
+def bench_index(ctx, out_dir):
+    search = _import("src.review_search")
+
+    count = search.build_review_index(
+        ctx["reviews"],
+        ctx["clustered"],
+        path=os.path.join(out_dir, search.INDEX_NAME)
+    )
+
+    return count, {}
+
+
+def bench_windows(ctx, out_dir):
+    windowed = _import("src.windowed_metrics")
+
+    with patched(windowed, PROCESSED_DIR=out_dir):
+        metrics = windowed.build_window_metrics(ctx["reviews"])
+
+    return len(ctx["reviews"]), {"window_metrics": metrics}
+
+
+def bench_rank(ctx, out_dir):
+    ranking = _import("src.ranking")
+
+    with patched(ranking, PROCESSED_DIR=out_dir):
+        ranked_df = ranking.compute_bayesian_score(ctx["clustered"].copy())
+        ranked_df = ranking.apply_sentiment_penalty(ranked_df)
+        ranked_df = ranking.compute_recency_weighted_score(
+            ranked_df,
+            ctx["window_metrics"]
+        )
+        ranked_df = ranking.rank_within_clusters(ranked_df)
+
+    return len(ranked_df), {"ranked": ranked_df}
+
+
+def bench_rerank(ctx, out_dir):
+    ranking = _import("src.ranking")
+
+    stats = ranking.build_ranking_stats(ctx["ranked"])
+    ranking.rerank(ctx["ranked"], stats, prior_strength=10, penalty_weight=0.5)
+
+    return len(ctx["ranked"]), {}
+
+
+def bench_bootstrap(ctx, out_dir):
+    uncertainty = _import("src.uncertainty")
+
+    uncertainty.score_intervals(ctx["ranked"], ctx["reviews"])
+
+    return len(ctx["ranked"]), {}
+
+
+def bench_evidence(ctx, out_dir):
+    evidence = _import("src.evidence")
+
+    with patched(evidence, PROCESSED_DIR=out_dir):
+        evidence_df = evidence.select_evidence(ctx["reviews"], ctx["clustered"])
+
+    return len(ctx["reviews"]), {"evidence": evidence_df}
+
+
+def bench_report(ctx, out_dir):
+    generation = _import("src.generation_openai")
+
+    with patched(
+        generation,
+        PROCESSED_DIR=out_dir,
+        get_openai_client=stubs.StubOpenAIClient
+    ):
+        generation.generate_reports(ctx["ranked"], ctx.get("evidence"))
+
+    return len(ctx["ranked"]), {}
+
+
+# (name, function, fixtures it needs)
+STAGES = [
+    ("preprocess", bench_preprocess, ("raw",)),
+    ("sentiment", bench_sentiment, ("reviews",)),
+    ("aggregate", bench_aggregate, ("reviews",)),
+    ("embed", bench_embed, ("products",)),
+    ("cluster", bench_cluster, ("filtered", "embeddings")),
+    ("interpret", bench_interpret, ("clustered",)),
+    ("index", bench_index, ("reviews", "clustered")),
+    ("windows", bench_windows, ("reviews",)),
+    ("rank", bench_rank, ("clustered", "window_metrics")),
+    ("rerank", bench_rerank, ("ranked",)),
+    ("bootstrap", bench_bootstrap, ("ranked", "reviews")),
+    ("evidence", bench_evidence, ("reviews", "clustered")),
+    ("report", bench_report, ("ranked",)),
+]
+
+
+# =====================================================
+# RUNNER
+# =====================================================
+
+def run_size(size: str, stages: list, repeat: int, seed: int) -> dict:
+    """
+    Benchmark every selected stage at one corpus size.
+    """
+
+    n_reviews = parse_size(size)
+
+    print(f"\n=== {size}: generating {n_reviews:,} synthetic reviews ===")
+    start = time.perf_counter()
+    ctx = {"raw": generate_reviews(n_reviews, seed=seed)}
+    print(f"Generated in {time.perf_counter() - start:.2f}s")
+
+    results = {}
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        for name, func, requires in STAGES:
+            key = f"{name}@{size}"
+
+            missing = [fixture for fixture in requires if fixture not in ctx]
+            if missing:
+                results[key] = {"status": "skipped", "reason": f"missing {missing}"}
+                print(f"{name:<12} skipped (missing {missing})")
+                continue
+
+            try:
+                timings = []
+                peak = None
+
+                for _ in range(repeat if name in stages else 1):
+                    profiling.reset_peak_rss()
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        start = time.perf_counter()
+                        rows, outputs = func(ctx, out_dir)
+                        timings.append(time.perf_counter() - start)
+                    peak = profiling.peak_rss_mb()
+
+                ctx.update(outputs)
+
+            except StageUnavailable as e:
+                results[key] = {"status": "unavailable", "reason": str(e)}
+                print(f"{name:<12} unavailable ({e})")
+                continue
+
+            if name not in stages:
+                # Ran once only to produce inputs for later stages.
+                continue
+
+            best = min(timings)
+            results[key] = {
+                "status": "ok",
+                "rows": rows,
+                "seconds_min": round(best, 6),
+                "seconds_median": round(statistics.median(timings), 6),
+                "items_per_sec": round(rows / best, 1) if best > 0 else None,
+                "peak_rss_mb": None if peak is None else round(peak, 1),
+                "repeat": len(timings),
+            }
+            print(
+                f"{name:<12} {best:>9.3f}s  "
+                f"{results[key]['items_per_sec'] or 0:>14,.0f} items/s"
+            )
+
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """
+    Return regressions: stages slower than baseline by more than ``threshold``.
+    """
+
+    regressions = []
+
+    print(f"\n=== COMPARISON (threshold +{threshold:.0%}) ===")
+    print(f"{'Benchmark':<20}{'Base s':>10}{'New s':>10}{'Change':>10}")
+
+    for key, new in results.items():
+        old = baseline.get("results", {}).get(key)
+
+        if not old or old.get("status") != "ok" or new.get("status") != "ok":
+            continue
+
+        base_s, new_s = old["seconds_min"], new["seconds_min"]
+        change = (new_s - base_s) / base_s if base_s else 0.0
+
+        flag = ""
+        if change > threshold and new_s - base_s > NOISE_FLOOR_SECONDS:
+            regressions.append(key)
+            flag = "  REGRESSION"
+
+        print(f"{key:<20}{base_s:>10.3f}{new_s:>10.3f}{change:>+10.0%}{flag}")
+
+    return regressions
+
+
+def _write_json(path: str, payload: dict) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2, sort_keys=True)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run pipeline benchmarks.")
+    parser.add_argument(
+        "--sizes",
+        nargs="+",
+        default=DEFAULT_SIZES,
+        help=f"Corpus sizes ({', '.join(SIZES)} or an integer)."
+    )
+    parser.add_argument(
+        "--stages",
+        nargs="+",
+        choices=[stage[0] for stage in STAGES],
+        default=[stage[0] for stage in STAGES]
+    )
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Store these results as the new baseline."
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Allowed slowdown vs baseline before failing (0.25 = +25%%)."
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+
+    args = parse_args(argv)
+
+    results = {}
+    for size in args.sizes:
+        results.update(run_size(size, args.stages, args.repeat, args.seed))
+
+    payload = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "host": platform.node(),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+        "seed": args.seed,
+        "results": results,
+    }
+
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    _write_json(f"{RESULTS_DIR}/run-{stamp}.json", payload)
+    _write_json(f"{RESULTS_DIR}/latest.json", payload)
+    print(f"\nSaved results to {RESULTS_DIR}/run-{stamp}.json")
+
+    if args.save_baseline:
+        _write_json(args.baseline, payload)
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("No baseline found; run with --save-baseline to create one.")
+        return 0
+
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    if baseline.get("host") != payload["host"]:
+        print(
+            f"Warning: baseline recorded on '{baseline.get('host')}', "
+            "timings may not be comparable."
+        )
+
+    regressions = compare(results, baseline, args.threshold)
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+
+    print("\nNo regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""
+Offline stand-ins for the model-backed stages.
+
+They mimic the interfaces the pipeline calls (Hugging Face
+pipeline, SentenceTransformer.encode, OpenAI chat client)
+with cheap deterministic computations, so benchmarks measure
+the pipeline's own overhead without downloads or API calls.
+"""
+
+import zlib
+
+import numpy as np
+
+from benchmarks.synthetic import NEGATIVE_WORDS
+
+EMBEDDING_DIM = 384  # all-MiniLM-L6-v2
+
+_NEGATIVE = set(NEGATIVE_WORDS)
+
+
+class StubSentimentClassifier:
+    """
+    Keyword-vote classifier with the transformers pipeline output format.
+    """
+
+    def __call__(self, texts, batch_size=16, **kwargs):
+        results = []
+        for text in texts:
+            negative = any(word in _NEGATIVE for word in text.lower().split())
+            label = "NEGATIVE" if negative else "POSITIVE"
+            results.append({"label": label, "score": 1.0})
+        return results
+
+
+class StubEmbeddingModel:
+    """
+    Hashed bag-of-words embeddings (L2-normalised).
+    """
+
+    def __init__(self, dim: int = EMBEDDING_DIM):
+        self.dim = dim
+
+    def encode(self, texts, batch_size=32, show_progress_bar=False, **kwargs):
+        embeddings = np.zeros((len(texts), self.dim), dtype=np.float32)
+
+        for row, text in enumerate(texts):
+            for word in text.split()[:512]:
+                embeddings[row, zlib.crc32(word.encode()) % self.dim] += 1.0
+
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        return embeddings / np.maximum(norms, 1e-12)
+
+
+class _StubMessage:
+    def __init__(self, content):
+        self.content = content
+
+
+class _StubChoice:
+    def __init__(self, content):
+        self.message = _StubMessage(content)
+
+
+class _StubResponse:
+    def __init__(self, content):
+        self.choices = [_StubChoice(content)]
+
+
+class _StubCompletions:
+    def create(self, model, messages, **kwargs):
+        prompt = messages[-1]["content"]
+        return _StubResponse(
+            "SECTION 1 — Executive Brief\n"
+            f"- Prompt length: {len(prompt)} characters\n\n"
+            "SECTION 2 — Blog Article\n"
+            "Synthetic report body."
+        )
+
+
+class _StubChat:
+    def __init__(self):
+        self.completions = _StubCompletions()
+
+
+class StubOpenAIClient:
+    """
+    Minimal ``OpenAI`` client replacement for report generation.
+    """
+
+    def __init__(self):
+        self.chat = _StubChat()
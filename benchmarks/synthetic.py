@@ -0,0 +1,225 @@
+"""
+Deterministic synthetic review corpus.
+
+Generates raw review rows shaped like the Amazon Electronics
+sample used by the pipeline (asin, title, rating, text,
+timestamp) with:
+
+- a Zipf-like product popularity skew,
+- a log-normal review length distribution,
+- a J-shaped star rating distribution,
+- a configurable share of reviews mentioning audio keywords,
+- sentiment words correlated with the star rating.
+
+The same ``(n_reviews, seed)`` always yields the same corpus.
+It is generated in fixed-size chunks, so memory stays flat
+at any size; ``write_reviews`` streams it straight to CSV.
+"""
+
+import numpy as np
+import pandas as pd
+
+from src.config import AUDIO_KEYWORDS
+
+SIZES = {
+    "10k": 10_000,
+    "100k": 100_000,
+    "1m": 1_000_000,
+    "10m": 10_000_000,
+}
+
+REVIEWS_PER_PRODUCT = 20
+AUDIO_SHARE = 0.6
+RATING_PROBS = [0.10, 0.06, 0.09, 0.18, 0.57]  # 1..5 stars
+MEDIAN_WORDS = 45
+
+# Rows generated at a time (bounds working memory; part of the
+# corpus definition, since each chunk has its own seed).
+CHUNK_SIZE = 50_000
+
+FILLER_WORDS = (
+    "the this it and was for with very my i but not have you that "
+    "they are one after use just so when would all had really get "
+    "time price quality product bought amazon works item unit box "
+    "cable battery charge range volume bass sound music phone tv car "
+    "pair connect setup button case fit ear size weight design"
+).split()
+
+POSITIVE_WORDS = (
+    "great excellent love amazing perfect clear crisp solid "
+    "comfortable recommend impressed awesome best happy"
+).split()
+
+NEGATIVE_WORDS = (
+    "terrible broke stopped returned disappointed poor cheap "
+    "static drain worst refund defective crackling useless"
+).split()
+
+# Audio keywords are kept in a separate pool so their share
+# can be controlled independently of review length.
+_VOCAB = np.array(FILLER_WORDS + POSITIVE_WORDS + NEGATIVE_WORDS + AUDIO_KEYWORDS)
+_VOCAB_LENGTHS = np.char.str_len(_VOCAB)
+_N_FILLER = len(FILLER_WORDS)
+_POS_OFFSET = _N_FILLER
+_NEG_OFFSET = _POS_OFFSET + len(POSITIVE_WORDS)
+_KW_OFFSET = _NEG_OFFSET + len(NEGATIVE_WORDS)
+
+
+def parse_size(size) -> int:
+    """
+    Accept "10k"/"1m" style labels or plain integers.
+    """
+
+    if isinstance(size, int):
+        return size
+
+    key = str(size).lower()
+    if key in SIZES:
+        return SIZES[key]
+
+    return int(key)
+
+
+def _review_chunk(
+    rng: np.random.Generator,
+    n_reviews: int,
+    product_weights: np.ndarray,
+    asins: np.ndarray,
+    audio_share: float
+) -> pd.DataFrame:
+    """
+    Generate ``n_reviews`` rows (one chunk of the corpus).
+    """
+
+    # -----------------------------
+    # Products (Zipf-like skew)
+    # -----------------------------
+    product_ids = rng.choice(len(product_weights), size=n_reviews, p=product_weights)
+
+    # -----------------------------
+    # Ratings and lengths
+    # -----------------------------
+    ratings = rng.choice(np.arange(1, 6), size=n_reviews, p=RATING_PROBS)
+
+    lengths = rng.lognormal(np.log(MEDIAN_WORDS), 0.8, size=n_reviews)
+    lengths = np.clip(lengths.astype(np.int64), 3, 600)
+
+    # -----------------------------
+    # Words
+    # -----------------------------
+    total = int(lengths.sum())
+    offsets = np.r_[0, np.cumsum(lengths)]
+
+    words = rng.integers(0, _N_FILLER, size=total, dtype=np.int16)
+
+    # Sentiment words: roughly one in eight, polarity follows rating.
+    sentiment_slots = rng.random(total, dtype=np.float32) < 0.125
+    positive = np.repeat(ratings >= 3, lengths)
+    words = np.where(
+        sentiment_slots & positive,
+        _POS_OFFSET + rng.integers(0, len(POSITIVE_WORDS), size=total, dtype=np.int16),
+        words
+    )
+    words = np.where(
+        sentiment_slots & ~positive,
+        _NEG_OFFSET + rng.integers(0, len(NEGATIVE_WORDS), size=total, dtype=np.int16),
+        words
+    )
+
+    # Audio keywords: one per review for the audio share.
+    has_audio = rng.random(n_reviews) < audio_share
+    keyword_pos = offsets[:-1] + (rng.random(n_reviews) * lengths).astype(np.int64)
+    words[keyword_pos[has_audio]] = (
+        _KW_OFFSET + rng.integers(0, len(AUDIO_KEYWORDS), size=int(has_audio.sum()))
+    )
+
+    # Join the whole chunk once and slice it per review (much
+    # faster than one join per review).
+    text = " ".join(_VOCAB[words].tolist())
+    char_ends = np.cumsum(_VOCAB_LENGTHS[words] + 1)
+    char_starts = np.r_[0, char_ends[:-1]]
+    starts = char_starts[offsets[:-1]].tolist()
+    ends = (char_ends[offsets[1:] - 1] - 1).tolist()
+    texts = [text[i:j] for i, j in zip(starts, ends)]
+
+    # -----------------------------
+    # Timestamps (ms since epoch, 2015-2023)
+    # -----------------------------
+    start_ms = 1_420_070_400_000
+    span_ms = 9 * 365 * 24 * 3600 * 1000
+    timestamps = start_ms + (rng.random(n_reviews) * span_ms).astype(np.int64)
+
+    return pd.DataFrame({
+        "asin": asins[product_ids],
+        "title": np.char.add("Synthetic audio product ", product_ids.astype(str)),
+        "rating": ratings.astype(np.float64),
+        "text": texts,
+        "timestamp": timestamps,
+    })
+
+
+def iter_reviews(
+    n_reviews: int,
+    seed: int = 42,
+    audio_share: float = AUDIO_SHARE
+):
+    """
+    Generate the corpus in chunks of ``CHUNK_SIZE`` rows.
+
+    Working memory is bounded by one chunk; each chunk has its
+    own generator seeded from ``(seed, chunk index)``.
+
+    Yields:
+        pd.DataFrame: Raw review chunk.
+    """
+
+    n_products = max(10, n_reviews // REVIEWS_PER_PRODUCT)
+    weights = 1.0 / np.arange(1, n_products + 1) ** 1.1
+    weights /= weights.sum()
+
+    asins = np.char.add("B0SYN", np.char.zfill(np.arange(n_products).astype(str), 6))
+
+    for index, start in enumerate(range(0, n_reviews, CHUNK_SIZE)):
+        rng = np.random.default_rng([seed, index])
+        size = min(CHUNK_SIZE, n_reviews - start)
+
+        yield _review_chunk(rng, size, weights, asins, audio_share)
+
+
+def generate_reviews(
+    n_reviews: int,
+    seed: int = 42,
+    audio_share: float = AUDIO_SHARE
+) -> pd.DataFrame:
+    """
+    Generate a raw review DataFrame of ``n_reviews`` rows.
+    """
+
+    return pd.concat(
+        iter_reviews(n_reviews, seed, audio_share),
+        ignore_index=True
+    )
+
+
+def write_reviews(
+    path: str,
+    n_reviews: int,
+    seed: int = 42,
+    audio_share: float = AUDIO_SHARE
+) -> None:
+    """
+    Write the corpus to CSV chunk by chunk, without holding
+    it in memory (for sizes that do not fit in RAM).
+    """
+
+    for index, chunk in enumerate(iter_reviews(n_reviews, seed, audio_share)):
+        chunk.to_csv(path, mode="w" if index == 0 else "a", header=index == 0, index=False)
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) != 3:
+        raise SystemExit("Usage: python -m benchmarks.synthetic SIZE OUT.csv")
+
+    write_reviews(sys.argv[2], parse_size(sys.argv[1]))
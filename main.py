@@ -3,53 +3,95 @@ Main execution pipeline for
 AI-Powered Review Intelligence for Consumer Audio Devices.
 """
 
-from src.preprocessing import preprocess
-from src.sentiment import evaluate_sentiment_model
-from src.aggregation import aggregate_products
-from src.clustering import (
-    filter_products,
-    generate_embeddings,
-    perform_clustering
-)
-from src.cluster_interpretation import interpret_clusters
-from src.ranking import (
-    compute_bayesian_score,
-    apply_sentiment_penalty,
-    rank_within_clusters
-)
-from src.generation_openai import generate_reports
-
-
-def main():
-
-    print("=== PHASE 2: PREPROCESSING ===")
-    df = preprocess()
-
-    print("\n=== PHASE 2B: SENTIMENT EVALUATION ===")
-    evaluate_sentiment_model(df)
-
-    print("\n=== PHASE 3: PRODUCT AGGREGATION ===")
-    product_df = aggregate_products(df)
-
-    print("\n=== PHASE 4: CLUSTERING ===")
-    product_df = filter_products(product_df)
-    embeddings = generate_embeddings(product_df)
-    clustered_df = perform_clustering(product_df, embeddings)
-
-    print("\n=== PHASE 4B: CLUSTER INTERPRETATION ===")
-    interpret_clusters(clustered_df)
-
-    print("\n=== PHASE 5: RANKING ENGINE ===")
-    ranked_df = compute_bayesian_score(clustered_df)
-    ranked_df = apply_sentiment_penalty(ranked_df)
-    ranked_df = rank_within_clusters(ranked_df)
-
-    print("\n=== PHASE 6: GENERATIVE REPORTING ===")
-    generate_reports(ranked_df)
+import argparse
+
+from src import profiling
+from src.batch_tuning import batch_settings
+from src.model_registry import model_stats
+from src.pipeline import STAGE_NAMES, run_pipeline, print_summary
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Run the review intelligence pipeline."
+    )
+    parser.add_argument(
+        "--from-stage",
+        choices=STAGE_NAMES,
+        help="Re-run this stage and everything after it; "
+             "earlier artifacts are read from data/processed/."
+    )
+    parser.add_argument(
+        "--only",
+        nargs="+",
+        choices=STAGE_NAMES,
+        metavar="STAGE",
+        help=f"Run only these stages. Choices: {', '.join(STAGE_NAMES)}"
+    )
+    parser.add_argument(
+        "--mode",
+        choices=["batch", "streaming"],
+        default="batch",
+        help="'streaming' overlaps ingest, scoring, aggregation and "
+             "embedding through bounded queues."
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Ignore cached stage outputs and re-run everything selected."
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Dump cProfile stats per stage to data/processed/profiles/ "
+             "(open with snakeviz or pstats)."
+    )
+    parser.add_argument(
+        "--report",
+        default=profiling.REPORT_PATH,
+        help="Where to write the JSON run report."
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+
+    args = parse_args(argv)
+
+    profiling.start_run(profile=args.profile)
+
+    if args.mode == "streaming":
+        if args.from_stage or args.only:
+            raise SystemExit(
+                "--from-stage/--only cannot be combined with --mode streaming."
+            )
+
+        from src.streaming import run_streaming, print_streaming_summary
+
+        with profiling.stage("streaming"):
+            stats = run_streaming()
+
+        print_streaming_summary(stats)
+        profiling.add_section("streaming", stats)
+
+        # Streaming writes the preprocess..embed artifacts;
+        # everything from clustering onward runs as usual.
+        results = run_pipeline(from_stage="cluster")
+    else:
+        results = run_pipeline(
+            from_stage=args.from_stage,
+            only=args.only,
+            force=args.force
+        )
+
+    print_summary(results)
+    profiling.add_section("models", model_stats())
+    profiling.add_section("batch_sizes", batch_settings())
+    profiling.write_report(args.report, argv)
 
     print("\nPipeline complete.")
     print("Artifacts saved in data/processed/")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -6,10 +6,12 @@ Transforms review-level data into product-level intelligence.
 
 import os
 import pandas as pd
+from src.profiling import instrument
 
 PROCESSED_DIR = "data/processed"
 
 
+@instrument()
 def aggregate_products(df: pd.DataFrame) -> pd.DataFrame:
     """
     Aggregate review-level data into product-level metrics.
@@ -52,12 +54,97 @@ def aggregate_products(df: pd.DataFrame) -> pd.DataFrame:
 
     print(f"Number of unique products: {len(product_df)}")
 
-    # -----------------------------
-    # Save to disk
-    # -----------------------------
+    save_products(product_df)
+
+    return product_df
+
+
+def save_products(product_df: pd.DataFrame) -> None:
+    """
+    Save product-level dataset to disk.
+    """
+
     os.makedirs(PROCESSED_DIR, exist_ok=True)
     product_df.to_csv(f"{PROCESSED_DIR}/products.csv", index=False)
 
     print("Saved products.csv")
 
-    return product_df
\ No newline at end of file
+
+class IncrementalAggregator:
+    """
+    Product aggregation over a stream of review batches.
+
+    Each batch is reduced to per-ASIN partial sums; partials
+    are merged on demand (and compacted periodically to bound
+    memory). ``result()`` matches ``aggregate_products`` on the
+    concatenated batches.
+    """
+
+    def __init__(self, compact_every: int = 50):
+        self.compact_every = compact_every
+        self._partials = []
+
+    @staticmethod
+    def _merge(partials: list) -> pd.DataFrame:
+        # groupby keeps row order within each ASIN, so texts
+        # are joined in arrival order like the batch version.
+        return pd.concat(partials, ignore_index=True).groupby("asin").agg(
+            title=("title", "first"),
+            review_count=("review_count", "sum"),
+            rating_sum=("rating_sum", "sum"),
+            negative_count=("negative_count", "sum"),
+            positive_count=("positive_count", "sum"),
+            combined_text=("combined_text", lambda x: " ".join(x))
+        ).reset_index()
+
+    def update(self, batch: pd.DataFrame) -> None:
+        """
+        Fold a labeled review batch into the running aggregates.
+        """
+
+        if batch.empty:
+            return
+
+        if "title" not in batch.columns:
+            raise ValueError(
+                "Column 'title' not found in dataset. "
+                "Ensure preprocessing step preserves product title."
+            )
+
+        partial = batch.assign(
+            is_negative=batch["sentiment_label"] == "negative",
+            is_positive=batch["sentiment_label"] == "positive"
+        ).groupby("asin", sort=False).agg(
+            title=("title", "first"),
+            review_count=("asin", "count"),
+            rating_sum=("rating", "sum"),
+            negative_count=("is_negative", "sum"),
+            positive_count=("is_positive", "sum"),
+            combined_text=("text", lambda x: " ".join(x))
+        ).reset_index()
+
+        self._partials.append(partial)
+
+        if len(self._partials) >= self.compact_every:
+            self._partials = [self._merge(self._partials)]
+
+    def result(self) -> pd.DataFrame:
+        """
+        Product-level dataset for all batches seen so far.
+        """
+
+        if not self._partials:
+            raise ValueError("No review batches were aggregated.")
+
+        merged = self._merge(self._partials)
+
+        product_df = merged[["asin", "title", "review_count"]].copy()
+        product_df["avg_rating"] = merged["rating_sum"] / merged["review_count"]
+        product_df["negative_count"] = merged["negative_count"]
+        product_df["positive_count"] = merged["positive_count"]
+        product_df["combined_text"] = merged["combined_text"]
+        product_df["negative_ratio"] = (
+            product_df["negative_count"] / product_df["review_count"]
+        )
+
+        return product_df
\ No newline at end of file
@@ -0,0 +1,481 @@
+"""
+Inference batch-size autotuning module.
+
+Picks the batch size for sentiment and embedding inference
+per model and machine instead of hard-coding it:
+
+- Calibration: a short sweep over ``BATCH_SIZE_CANDIDATES``
+  on sample texts. Each candidate first runs one batch of the
+  longest texts (worst-case padding, memory probe), then a
+  timed pass over ``BATCH_CALIBRATION_ITEMS`` random texts.
+  The fastest candidate (items/sec) whose memory peak stays
+  under the ceiling wins.
+- Ceiling: ``BATCH_MEMORY_FRACTION`` of the container's
+  memory limit (cgroup) or physical memory, or of GPU memory
+  when the model runs on CUDA.
+- Persistence: results are stored in ``batch_sizes.json``
+  keyed by model and host fingerprint (CPU, core count,
+  memory, device), so each machine calibrates once.
+- Backoff: ``run_batched`` halves the batch size and retries
+  when inference runs out of memory, and persists the
+  smaller size.
+
+Chosen settings are collected in ``batch_settings()`` for
+the run report.
+"""
+
+import heapq
+import json
+import os
+import platform
+import random
+import threading
+import time
+
+from src.config import (
+    BATCH_AUTOTUNE,
+    BATCH_SIZE_CANDIDATES,
+    BATCH_CALIBRATION_ITEMS,
+    BATCH_MEMORY_FRACTION,
+    RANDOM_STATE
+)
+from src.profiling import peak_rss_mb
+
+PROCESSED_DIR = "data/processed"
+TUNING_PATH = f"{PROCESSED_DIR}/batch_sizes.json"
+
+# Used when autotuning is off (the previous hard-coded sizes)
+DEFAULT_BATCH_SIZES = {
+    "sentiment": 16,
+    "embedding": 32,
+}
+
+# Batches handed to the model per call in run_batched; a
+# memory error only repeats this much work.
+BATCHES_PER_CALL = 8
+
+# Smaller batch preferred when within this share of the best
+# throughput (same speed, less memory).
+THROUGHPUT_TOLERANCE = 0.03
+
+# Stop the sweep once a candidate is this much slower than
+# the best so far (past the throughput knee).
+SLOWDOWN_STOP = 0.10
+
+# Lower-cased fragments of out-of-memory errors that are not
+# MemoryError: CUDA ("CUDA out of memory") and torch's CPU
+# allocator ("DefaultCPUAllocator: can't allocate memory").
+OOM_MESSAGES = (
+    "out of memory",
+    "can't allocate memory",
+    "cannot allocate memory",
+    "defaultcpuallocator",
+)
+
+_lock = threading.Lock()
+_settings = {}
+
+
+# =====================================================
+# HOST AND MEMORY
+# =====================================================
+
+def _cpu_name() -> str:
+    try:
+        with open("/proc/cpuinfo", "r", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor() or platform.machine()
+
+
+def _cgroup_limit_bytes():
+    for path in (
+        "/sys/fs/cgroup/memory.max",                     # cgroup v2
+        "/sys/fs/cgroup/memory/memory.limit_in_bytes",   # cgroup v1
+    ):
+        try:
+            with open(path, "r", encoding="ascii") as f:
+                value = f.read().strip()
+        except OSError:
+            continue
+        if value.isdigit():
+            return int(value)
+    return None
+
+
+def memory_limit_mb():
+    """
+    Memory available to this process in MB: the container's
+    cgroup limit if set, else physical memory. None if unknown.
+    """
+
+    limits = []
+
+    cgroup = _cgroup_limit_bytes()
+    if cgroup is not None:
+        limits.append(cgroup)
+
+    try:
+        limits.append(os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES"))
+    except (AttributeError, ValueError, OSError):
+        pass
+
+    # cgroup v1 reports a huge number when unlimited
+    return min(limits) / (1024 * 1024) if limits else None
+
+
+def _cuda_index(device: str) -> int:
+    return int(device.split(":")[1]) if ":" in device else 0
+
+
+def memory_ceiling_mb(device: str = "cpu"):
+    """
+    Peak memory a calibration batch may reach (process RSS on
+    CPU, allocated tensor memory on CUDA).
+    """
+
+    if device.startswith("cuda"):
+        import torch
+
+        total = torch.cuda.get_device_properties(_cuda_index(device)).total_memory
+        return BATCH_MEMORY_FRACTION * total / (1024 * 1024)
+
+    limit = memory_limit_mb()
+    return None if limit is None else BATCH_MEMORY_FRACTION * limit
+
+
+def host_fingerprint(device: str = "cpu") -> str:
+    """
+    Hardware-based host key (stable across container restarts,
+    unlike the hostname).
+    """
+
+    parts = [
+        platform.machine(),
+        _cpu_name(),
+        f"{os.cpu_count()}cpu",
+    ]
+
+    limit = memory_limit_mb()
+    if limit is not None:
+        parts.append(f"{limit / 1024:.0f}GB")
+
+    if device.startswith("cuda"):
+        import torch
+
+        parts.append(torch.cuda.get_device_name(_cuda_index(device)))
+    else:
+        parts.append("cpu")
+
+    return "|".join(parts)
+
+
+def _peak_memory_mb(device: str):
+    if device.startswith("cuda"):
+        import torch
+
+        return torch.cuda.max_memory_allocated(_cuda_index(device)) / (1024 * 1024)
+    return peak_rss_mb()
+
+
+def _reset_device_peak(device: str) -> None:
+    # The process RSS high-water mark is left alone: resetting
+    # it would hide the enclosing stage's peak from profiling.
+    if device.startswith("cuda"):
+        import torch
+
+        torch.cuda.reset_peak_memory_stats(_cuda_index(device))
+
+
+def is_out_of_memory(error: Exception) -> bool:
+    """
+    True for host and CUDA out-of-memory errors.
+    """
+
+    if isinstance(error, MemoryError):
+        return True
+    if type(error).__name__ == "OutOfMemoryError":  # torch.cuda
+        return True
+    if not isinstance(error, RuntimeError):
+        return False
+
+    message = str(error).lower()
+    return any(fragment in message for fragment in OOM_MESSAGES)
+
+
+def _free_device_memory(device: str) -> None:
+    if device.startswith("cuda"):
+        import torch
+
+        torch.cuda.empty_cache()
+
+
+# =====================================================
+# PERSISTENCE
+# =====================================================
+
+def _load_tuning(path: str) -> dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_entry(key: str, entry: dict, path: str) -> None:
+    with _lock:
+        tuning = _load_tuning(path)
+        tuning[key] = entry
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(tuning, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, path)
+
+
+def tuning_key(name: str, model_id: str, device: str = "cpu") -> str:
+    return f"{name}:{model_id}@{host_fingerprint(device)}"
+
+
+# =====================================================
+# CALIBRATION
+# =====================================================
+
+def calibrate(
+    infer,
+    texts: list,
+    candidates=BATCH_SIZE_CANDIDATES,
+    items: int = BATCH_CALIBRATION_ITEMS,
+    device: str = "cpu"
+) -> dict:
+    """
+    Sweep batch sizes and pick the fastest one within the
+    memory ceiling.
+
+    Args:
+        infer: ``infer(texts, batch_size)`` running the model.
+        texts: Texts to sample from (the real workload).
+
+    Returns:
+        dict: batch_size, items_per_sec, peak_memory_mb,
+        ceiling_mb and the per-candidate sweep.
+    """
+
+    candidates = sorted(candidates)
+    ceiling = memory_ceiling_mb(device)
+
+    timed = random.Random(RANDOM_STATE).sample(texts, min(items, len(texts)))
+    longest = heapq.nlargest(max(candidates), texts, key=len)
+
+    # A batch must not push the peak above the ceiling (or
+    # above what the process had already reached before).
+    limit = None if ceiling is None else max(ceiling, _peak_memory_mb(device) or 0)
+
+    sweep = []
+    best = None
+
+    for batch_size in candidates:
+        _reset_device_peak(device)
+
+        try:
+            # Memory probe: worst-case padding, also a warm-up
+            infer(longest[:batch_size], batch_size)
+
+            start = time.perf_counter()
+            infer(timed, batch_size)
+            seconds = time.perf_counter() - start
+
+        except Exception as e:
+            if not is_out_of_memory(e):
+                raise
+            _free_device_memory(device)
+            sweep.append({"batch_size": batch_size, "status": "out_of_memory"})
+            break
+
+        peak = _peak_memory_mb(device)
+        result = {
+            "batch_size": batch_size,
+            "items_per_sec": round(len(timed) / max(seconds, 1e-9), 2),
+            "peak_memory_mb": None if peak is None else round(peak, 1),
+        }
+
+        if limit is not None and peak is not None and peak > limit:
+            result["status"] = "over_memory_ceiling"
+            sweep.append(result)
+            break
+
+        result["status"] = "ok"
+        sweep.append(result)
+
+        if best is None or result["items_per_sec"] > best["items_per_sec"] * (1 + THROUGHPUT_TOLERANCE):
+            best = result
+        elif result["items_per_sec"] < best["items_per_sec"] * (1 - SLOWDOWN_STOP):
+            break
+
+    if best is None:
+        # Even the smallest candidate failed: go below it and
+        # rely on run_batched to back off further.
+        best = {"batch_size": max(1, candidates[0] // 2), "items_per_sec": None,
+                "peak_memory_mb": None}
+
+    return {
+        "batch_size": best["batch_size"],
+        "items_per_sec": best["items_per_sec"],
+        "peak_memory_mb": best["peak_memory_mb"],
+        "ceiling_mb": None if ceiling is None else round(ceiling, 1),
+        "calibration_items": len(timed),
+        "sweep": sweep,
+    }
+
+
+def tuned_batch_size(
+    name: str,
+    model_id: str,
+    infer,
+    texts: list,
+    device: str = "cpu",
+    path: str = TUNING_PATH
+) -> int:
+    """
+    Batch size for one model on this host: persisted result,
+    else a fresh calibration on ``texts``.
+
+    Returns ``DEFAULT_BATCH_SIZES[name]`` when
+    ``BATCH_AUTOTUNE`` is off.
+    """
+
+    if not BATCH_AUTOTUNE:
+        setting = {"batch_size": DEFAULT_BATCH_SIZES[name], "source": "default"}
+
+    else:
+        key = tuning_key(name, model_id, device)
+
+        with _lock:
+            entry = _load_tuning(path).get(key)
+
+        source = "cached"
+
+        if entry is None:
+            print(f"Calibrating {name} batch size ({device})...")
+            start = time.perf_counter()
+            entry = calibrate(infer, texts, device=device)
+            entry["calibration_seconds"] = round(time.perf_counter() - start, 2)
+            entry["tuned_at"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+            _save_entry(key, entry, path)
+            source = "calibrated"
+
+        setting = {
+            **{k: v for k, v in entry.items() if k != "sweep"},
+            "source": source,
+            "key": key,
+        }
+
+    setting.update({"model": model_id, "device": device, "backoffs": 0})
+
+    with _lock:
+        _settings[name] = setting
+
+    print(f"{name} batch size: {setting['batch_size']} ({setting['source']})")
+
+    return setting["batch_size"]
+
+
+# =====================================================
+# RUNTIME
+# =====================================================
+
+def run_batched(
+    name: str,
+    infer,
+    texts: list,
+    batch_size: int = None,
+    device: str = "cpu",
+    path: str = TUNING_PATH,
+    show_progress_bar: bool = False
+) -> list:
+    """
+    Run ``infer(chunk, batch_size)`` over ``texts`` in chunks
+    of ``BATCHES_PER_CALL`` batches, halving the batch size
+    and retrying the chunk on out-of-memory errors.
+
+    ``batch_size=None`` uses the current setting for ``name``
+    (tuned, or reduced by an earlier backoff). The progress
+    bar covers all texts (one bar, not one per chunk).
+
+    Returns:
+        list: One ``infer`` result per chunk, in order.
+    """
+
+    if batch_size is None:
+        with _lock:
+            batch_size = _settings.get(name, {}).get("batch_size", DEFAULT_BATCH_SIZES[name])
+
+    results = []
+    position = 0
+    progress = _progress_bar(name, len(texts)) if show_progress_bar else None
+
+    try:
+        while position < len(texts):
+            chunk = texts[position:position + batch_size * BATCHES_PER_CALL]
+
+            try:
+                results.append(infer(chunk, batch_size))
+            except Exception as e:
+                if not is_out_of_memory(e) or batch_size == 1:
+                    raise
+                _free_device_memory(device)
+                batch_size = _back_off(name, batch_size, path)
+                continue
+
+            position += len(chunk)
+            if progress is not None:
+                progress.update(len(chunk))
+
+    finally:
+        if progress is not None:
+            progress.close()
+
+    return results
+
+
+def _progress_bar(name: str, total: int):
+    try:
+        from tqdm.auto import tqdm  # installed with transformers
+    except ImportError:
+        return None
+
+    return tqdm(total=total, desc=f"{name} inference", unit="text")
+
+
+def _back_off(name: str, batch_size: int, path: str) -> int:
+    smaller = max(1, batch_size // 2)
+
+    print(f"Out of memory in {name} inference at batch size {batch_size}; retrying with {smaller}")
+
+    with _lock:
+        setting = _settings.setdefault(name, {"source": "default", "backoffs": 0})
+        setting["batch_size"] = smaller
+        setting["backoffs"] = setting.get("backoffs", 0) + 1
+        key = setting.get("key")
+        entry = _load_tuning(path).get(key) if key else None
+
+    # Next run starts from the size that worked
+    if entry is not None:
+        entry["batch_size"] = min(entry["batch_size"], smaller)
+        entry["backoffs"] = entry.get("backoffs", 0) + 1
+        _save_entry(key, entry, path)
+
+    return smaller
+
+
+def batch_settings() -> dict:
+    """
+    Chosen batch size (and how it was chosen) per model.
+    """
+
+    with _lock:
+        return {name: dict(setting) for name, setting in _settings.items()}
@@ -0,0 +1,213 @@
+"""
+Command-line interface.
+
+    python -m src.cli ingest     # load, filter, label, aggregate
+    python -m src.cli score      # sentiment model evaluation
+    python -m src.cli embed      # product embeddings
+    python -m src.cli cluster    # KMeans + TF-IDF interpretation
+    python -m src.cli index      # SQLite FTS5 review search index
+    python -m src.cli rank       # ranking (and what-if re-ranking)
+    python -m src.cli report     # review evidence, OpenAI reports, PDFs
+    python -m src.cli serve      # Streamlit dashboard
+
+Heavy dependencies (transformers, torch, sentence-transformers,
+sklearn, openai, datasets) are imported only inside the commands
+that need them, so light commands start in well under a second.
+Keep module-level imports in this file to the standard library.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+# Pipeline stages each subcommand runs (see src/pipeline.py).
+COMMAND_STAGES = {
+    "ingest": ["preprocess", "aggregate"],
+    "score": ["sentiment"],
+    "embed": ["embed"],
+    "cluster": ["cluster", "interpret"],
+    "index": ["index"],
+    "rank": ["windows", "rank"],
+    "report": ["evidence", "report", "pdf"],
+}
+
+# Commands that must stay fast to start; checked by
+# benchmarks/import_time.py against IMPORT_BUDGET_MS.
+LIGHT_COMMANDS = ("rank", "serve")
+
+IMPORT_BUDGET_MS = {
+    "rank": 1500,
+    "serve": 150,
+}
+
+HEAVY_MODULES = (
+    "torch",
+    "transformers",
+    "sentence_transformers",
+    "sklearn",
+    "openai",
+    "datasets",
+    "streamlit",
+)
+
+
+def _run_stages(args) -> int:
+    from src import profiling
+    from src.batch_tuning import batch_settings
+    from src.model_registry import model_stats
+    from src.pipeline import run_pipeline, print_summary
+
+    profiling.start_run(profile=args.profile)
+
+    results = run_pipeline(
+        stages=COMMAND_STAGES[args.command],
+        force=args.force
+    )
+
+    print_summary(results)
+    profiling.add_section("models", model_stats())
+    profiling.add_section("batch_sizes", batch_settings())
+    profiling.write_report(args.report, sys.argv[1:])
+
+    return 0
+
+
+def _rank(args) -> int:
+    """
+    Run the rank stage, or print a what-if ranking without
+    touching the pipeline artifacts.
+    """
+
+    what_if = any(
+        value is not None
+        for value in (args.method, args.prior_strength, args.prior_mean,
+                      args.penalty_weight, args.confidence)
+    )
+
+    if not what_if:
+        return _run_stages(args)
+
+    import pandas as pd
+    from src.ranking import build_ranking_stats, rerank
+
+    df = pd.read_csv(args.input)
+    stats = build_ranking_stats(df)
+
+    reranked = rerank(
+        df,
+        stats,
+        method=args.method,
+        prior_strength=args.prior_strength,
+        prior_mean=args.prior_mean,
+        penalty_weight=args.penalty_weight,
+        confidence=args.confidence
+    )
+
+    top = (
+        reranked[reranked["cluster_rank"] <= args.top]
+        .sort_values(["cluster", "cluster_rank"])
+    )
+
+    columns = ["cluster", "cluster_rank", "asin", "final_score",
+               "review_count", "avg_rating", "negative_ratio"]
+    print(top[columns].to_string(index=False))
+
+    if args.output:
+        reranked.to_csv(args.output, index=False)
+        print(f"\nSaved {args.output}")
+
+    return 0
+
+
+def _serve(args) -> int:
+    command = [
+        sys.executable, "-m", "streamlit", "run", args.app,
+        "--server.port", str(args.port),
+    ]
+    return subprocess.call(command)
+
+
+def load_command_modules(command: str) -> None:
+    """
+    Import what ``command`` needs before doing any work.
+
+    Used by the import-time budget check to measure start-up
+    cost without running the command.
+    """
+
+    if command == "serve":
+        return
+
+    if command == "rank":
+        import pandas  # noqa: F401
+        import src.ranking  # noqa: F401
+        import src.pipeline  # noqa: F401
+        return
+
+    import src.pipeline  # noqa: F401
+
+
+def _confidence(value: str) -> float:
+    confidence = float(value)
+    if not 0 < confidence < 1:
+        raise argparse.ArgumentTypeError(
+            f"confidence must be between 0 and 1 (exclusive), got {value}"
+        )
+    return confidence
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.cli",
+        description="AI-Powered Review Intelligence pipeline commands."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    for command, stages in COMMAND_STAGES.items():
+        sub = subparsers.add_parser(
+            command,
+            help=f"Run pipeline stage(s): {', '.join(stages)}."
+        )
+        sub.add_argument(
+            "--force",
+            action="store_true",
+            help="Re-run even if cached outputs are valid."
+        )
+        sub.add_argument("--profile", action="store_true")
+        sub.add_argument("--report", default="data/processed/run_report.json")
+        sub.set_defaults(handler=_run_stages)
+
+        if command == "rank":
+            sub.description = (
+                "Run the rank stage. With any what-if option, re-rank "
+                "ranked_products.csv in memory and print the top products."
+            )
+            sub.add_argument("--method", choices=["bayesian", "wilson", "beta"])
+            sub.add_argument("--prior-strength", type=float)
+            sub.add_argument("--prior-mean", type=float)
+            sub.add_argument("--penalty-weight", type=float)
+            sub.add_argument("--confidence", type=_confidence)
+            sub.add_argument("--top", type=int, default=5)
+            sub.add_argument(
+                "--input",
+                default=os.path.join("data", "processed", "ranked_products.csv")
+            )
+            sub.add_argument("--output", help="Write the what-if ranking to CSV.")
+            sub.set_defaults(handler=_rank)
+
+    serve = subparsers.add_parser("serve", help="Launch the Streamlit dashboard.")
+    serve.add_argument("--app", default="app.py")
+    serve.add_argument("--port", type=int, default=8501)
+    serve.set_defaults(handler=_serve)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,10 +8,12 @@ and identifies representative products.
 import os
 import pandas as pd
 from sklearn.feature_extraction.text import TfidfVectorizer
+from src.profiling import instrument
 
 PROCESSED_DIR = "data/processed"
 
 
+@instrument()
 def interpret_clusters(clustered_df: pd.DataFrame) -> None:
     """
     Generate cluster summaries using TF-IDF and save results.
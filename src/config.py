@@ -13,6 +13,11 @@ RANDOM_STATE = 42
 # -----------------------------
 DATASET_SAMPLE_SIZE = 50000  # Stable, efficient, sufficient for clustering
 
+# -----------------------------
+# Pipeline Cache
+# -----------------------------
+PIPELINE_CACHE_KEEP = 2  # Cached output versions kept per stage (current + previous)
+
 # -----------------------------
 # Model Names
 # -----------------------------
@@ -22,11 +27,73 @@ EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
 
 GENERATION_MODEL = "google/flan-t5-base"
 
+# -----------------------------
+# Model Registry
+# -----------------------------
+MODEL_WARMUP = True  # Run one tiny inference right after loading
+
+MODEL_MEMORY_BUDGET_MB = 4096  # Evict least recently used models above this
+
+# -----------------------------
+# Inference Batch Sizes
+# -----------------------------
+BATCH_AUTOTUNE = True  # Calibrate once per model and host; False uses fixed sizes
+
+BATCH_SIZE_CANDIDATES = (8, 16, 32, 64, 128)
+
+BATCH_CALIBRATION_ITEMS = 128  # Sample texts timed per candidate
+
+BATCH_MEMORY_FRACTION = 0.8  # Ceiling: share of container / machine (or GPU) memory
+
 # -----------------------------
 # Clustering Configuration
 # -----------------------------
 N_CLUSTERS = 5  # Corporate-appropriate number of meta-categories
 
+# Human-friendly category names per cluster
+CATEGORY_MAP = {
+    0: "Portable Bluetooth Speakers",
+    1: "Car Audio & Radio Devices",
+    2: "Home / TV Speaker Systems",
+    3: "Headphones & Earbuds",
+    4: "Smart Speakers (Alexa / Echo)"
+}
+
+# -----------------------------
+# Time-Windowed Metrics
+# -----------------------------
+WINDOW_BUCKET_DAYS = 30  # Bucket width; windows round up to whole buckets
+
+WINDOW_DAYS = (30, 90, 365)  # Rolling windows reported per product
+
+RECENCY_HALF_LIFE_DAYS = 365  # Review weight halves every this many days
+
+# -----------------------------
+# Score Uncertainty (Bootstrap)
+# -----------------------------
+BOOTSTRAP_RESAMPLES = 1000
+
+BOOTSTRAP_CONFIDENCE = 0.90  # Width of the reported score interval
+
+BOOTSTRAP_TOP_K = 3  # Rank-stability reported as P(top-k in cluster)
+
+BOOTSTRAP_EXACT_MAX_REVIEWS = 64  # Exact resampling below, normal limit above
+
+BOOTSTRAP_POOL_SIZE = 1024  # Resampling patterns kept per review count (fits in cache)
+
+# -----------------------------
+# Report Evidence
+# -----------------------------
+EVIDENCE_TOKEN_BUDGET = 60  # Estimated tokens of evidence per product and polarity (candidate pool for PROMPT_TOKEN_BUDGET fitting)
+
+PROMPT_TOKEN_BUDGET = 512  # Whole local (T5) prompt incl. evidence; longer input is truncated
+
+EVIDENCE_MAX_SENTENCES = 2  # Per product and polarity
+
+EVIDENCE_MIN_WORDS = 5
+
+EVIDENCE_MAX_WORDS = 40
+
 # -----------------------------
 # Audio Filtering Keywords
 # -----------------------------
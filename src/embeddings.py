@@ -0,0 +1,102 @@
+"""
+Embedding module.
+
+Selects the products to embed and generates their sentence
+embeddings (kept apart from clustering so that clustering
+changes do not invalidate the cached embeddings).
+"""
+
+import os
+import numpy as np
+import pandas as pd
+from src.batch_tuning import run_batched, tuned_batch_size
+from src.config import EMBEDDING_MODEL
+from src.model_registry import get_model
+from src.profiling import instrument
+
+PROCESSED_DIR = "data/processed"
+
+
+def filter_products(product_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Keep only products with at least 3 reviews.
+    """
+
+    # 🔥 UPDATED THRESHOLD HERE
+    filtered = product_df[product_df["review_count"] >= 3].copy()
+
+    print(f"Products with ≥3 reviews: {len(filtered)}")
+
+    return filtered.reset_index(drop=True)
+
+
+def build_embedding_model():
+    """
+    Build the sentence embedding model.
+    """
+    from sentence_transformers import SentenceTransformer
+
+    return SentenceTransformer(EMBEDDING_MODEL)
+
+
+def warm_up_embedding_model(model) -> None:
+    model.encode(["Warm-up product text: wireless headphones."])
+
+
+def load_embedding_model():
+    """
+    Shared sentence embedding model, loaded once per process.
+    """
+    return get_model("embedding")
+
+
+@instrument()
+def generate_embeddings(product_df: pd.DataFrame) -> np.ndarray:
+    """
+    Generate sentence embeddings for combined product text.
+    """
+
+    print("Loading embedding model...")
+    model = load_embedding_model()
+
+    embeddings = encode_texts(
+        model,
+        product_df["combined_text"].tolist(),
+        show_progress_bar=True
+    )
+
+    save_embeddings(embeddings)
+
+    return embeddings
+
+
+def encode_texts(model, texts: list, show_progress_bar: bool = False) -> np.ndarray:
+    """
+    Encode texts with the autotuned batch size (backs off on
+    out-of-memory errors).
+    """
+
+    def infer(batch, batch_size):
+        return model.encode(batch, batch_size=batch_size)
+
+    device = str(getattr(model, "device", "cpu"))
+    batch_size = tuned_batch_size("embedding", EMBEDDING_MODEL, infer, texts, device)
+
+    print("Generating embeddings...")
+    chunks = run_batched(
+        "embedding",
+        infer,
+        texts,
+        batch_size,
+        device,
+        show_progress_bar=show_progress_bar
+    )
+
+    return np.concatenate(chunks) if chunks else np.empty((0, 0), dtype=np.float32)
+
+
+def save_embeddings(embeddings: np.ndarray) -> None:
+    os.makedirs(PROCESSED_DIR, exist_ok=True)
+    np.save(f"{PROCESSED_DIR}/product_embeddings.npy", embeddings)
+
+    print("Saved product_embeddings.npy")
@@ -0,0 +1,319 @@
+"""
+Review evidence module.
+
+Selects the few most representative positive and negative
+review sentences per product, under a strict token budget,
+so generated reports can cite real customer language
+without sending whole reviews to the model.
+
+Per cluster, sentences are TF-IDF vectorized once; each
+(product, polarity) group gets a centroid via one sparse
+matrix product, and a sentence's centrality is its cosine
+similarity to its group centroid. Selection (best first,
+until the budget is spent) is a sort plus a grouped
+cumulative sum — no Python loop per product.
+"""
+
+import math
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from src.config import (
+    EVIDENCE_TOKEN_BUDGET,
+    EVIDENCE_MAX_SENTENCES,
+    EVIDENCE_MIN_WORDS,
+    EVIDENCE_MAX_WORDS
+)
+from src.profiling import instrument
+
+PROCESSED_DIR = "data/processed"
+
+POLARITIES = ("positive", "negative")
+
+# Prompt size / latency per generated report (see log_prompt)
+_prompt_log = []
+_prompt_lock = threading.Lock()
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough token count for budgeting (~4 characters per token
+    for English text with OpenAI / T5 style tokenizers).
+    """
+
+    return math.ceil(len(text) / 4)
+
+
+def split_sentences(review_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    One row per review sentence: asin, polarity, sentence, tokens.
+
+    Polarity is the review's star-based sentiment label.
+    Very short and very long sentences are dropped, as are
+    exact repeats within a product.
+    """
+
+    text = (
+        review_df["text"].astype(str)
+        .str.replace(r"<br\s*/?>", " ", regex=True)
+        .str.replace(r"\s+", " ", regex=True)
+    )
+
+    sentences = pd.DataFrame({
+        "asin": review_df["asin"].to_numpy(),
+        "polarity": review_df["sentiment_label"].to_numpy(),
+        "sentence": text.str.split(r"(?<=[.!?])\s+", regex=True).to_numpy(),
+    }).explode("sentence", ignore_index=True)
+
+    sentences["sentence"] = sentences["sentence"].str.strip()
+    words = sentences["sentence"].str.count(r"\S+")
+
+    sentences = sentences[
+        (words >= EVIDENCE_MIN_WORDS) & (words <= EVIDENCE_MAX_WORDS)
+    ]
+    sentences = sentences.drop_duplicates(["asin", "polarity", "sentence"])
+
+    # Vectorized estimate_tokens
+    sentences["tokens"] = sentences["sentence"].str.len().add(3).floordiv(4)
+
+    return sentences.reset_index(drop=True)
+
+
+def sentence_centrality(sentences: pd.DataFrame) -> np.ndarray:
+    """
+    Cosine similarity of each sentence to its (asin, polarity)
+    TF-IDF centroid, for one cluster's sentences.
+    """
+
+    # Imported here: the dashboard imports this module (via
+    # src.generation_openai) without scikit-learn installed.
+    from scipy import sparse
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.preprocessing import normalize
+
+    vectorizer = TfidfVectorizer(stop_words="english", sublinear_tf=True)
+
+    try:
+        X = vectorizer.fit_transform(sentences["sentence"])
+    except ValueError:
+        # Only stop words in this cluster
+        return np.zeros(len(sentences))
+
+    groups = sentences.groupby(["asin", "polarity"], sort=False).ngroup().to_numpy()
+
+    # Sparse (group x sentence) indicator: one product sums
+    # every group's sentence vectors.
+    membership = sparse.csr_matrix(
+        (np.ones(len(groups)), (groups, np.arange(len(groups)))),
+        shape=(groups.max() + 1, len(groups))
+    )
+    centroids = normalize(membership @ X)
+
+    return np.asarray(X.multiply(centroids[groups]).sum(axis=1)).ravel()
+
+
+def select_within_budget(
+    sentences: pd.DataFrame,
+    budget: int = EVIDENCE_TOKEN_BUDGET,
+    max_sentences: int = EVIDENCE_MAX_SENTENCES
+) -> pd.DataFrame:
+    """
+    Most central sentences per (asin, polarity) whose running
+    token total stays within ``budget``.
+    """
+
+    ranked = sentences[sentences["tokens"] <= budget].sort_values(
+        ["asin", "polarity", "score"],
+        ascending=[True, True, False],
+        kind="stable"
+    )
+
+    group = ranked.groupby(["asin", "polarity"], sort=False)
+    spent = group["tokens"].cumsum()
+    rank = group.cumcount() + 1
+
+    selected = ranked[(spent <= budget) & (rank <= max_sentences)].copy()
+    selected["rank"] = selected.groupby(["asin", "polarity"]).cumcount() + 1
+
+    return selected
+
+
+@instrument()
+def select_evidence(review_df: pd.DataFrame, cluster_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Build and save the evidence table for every clustered product.
+
+    Returns:
+        pd.DataFrame: asin, cluster, polarity, rank, sentence,
+        score, tokens.
+    """
+
+    print("Selecting review evidence per product...")
+
+    clusters = cluster_df[["asin", "cluster"]]
+    reviews = review_df[review_df["asin"].isin(clusters["asin"])]
+
+    sentences = split_sentences(reviews).merge(clusters, on="asin")
+
+    selected = []
+
+    for cluster_id, cluster_sentences in sentences.groupby("cluster"):
+        cluster_sentences = cluster_sentences.copy()
+        cluster_sentences["score"] = sentence_centrality(cluster_sentences)
+        selected.append(select_within_budget(cluster_sentences))
+
+    columns = ["asin", "cluster", "polarity", "rank", "sentence", "score", "tokens"]
+
+    evidence_df = (
+        pd.concat(selected, ignore_index=True)[columns]
+        if selected else pd.DataFrame(columns=columns)
+    )
+
+    print(
+        f"{len(evidence_df)} evidence sentences for "
+        f"{evidence_df['asin'].nunique()} products "
+        f"(budget {EVIDENCE_TOKEN_BUDGET} tokens per product and polarity)"
+    )
+
+    os.makedirs(PROCESSED_DIR, exist_ok=True)
+    evidence_df.to_csv(f"{PROCESSED_DIR}/product_evidence.csv", index=False)
+
+    print("Saved product_evidence.csv")
+
+    return evidence_df
+
+
+def evidence_for(evidence_df: pd.DataFrame, asins) -> dict:
+    """
+    Selected sentences per product:
+    ``{asin: {"positive": [...], "negative": [...]}}``.
+    """
+
+    result = {asin: {polarity: [] for polarity in POLARITIES} for asin in asins}
+
+    if evidence_df is None:
+        return result
+
+    rows = evidence_df[evidence_df["asin"].isin(result)].sort_values(
+        ["asin", "polarity", "rank"]
+    )
+
+    for asin, polarity, sentence in rows[["asin", "polarity", "sentence"]].itertuples(
+        index=False, name=None
+    ):
+        result[asin][polarity].append(sentence)
+
+    return result
+
+
+def fit_evidence(build, evidence: dict, count_tokens, budget: int) -> str:
+    """
+    Largest prompt ``build(evidence_subset)`` of at most
+    ``budget`` tokens, counted by ``count_tokens`` on the
+    whole prompt.
+
+    Sentences are added best rank first, one per product and
+    polarity per round, in product order; a sentence that
+    would overflow the budget is skipped. If even the prompt
+    without quotes does not fit, ``build(None)`` is returned.
+    """
+
+    chosen = {asin: {polarity: [] for polarity in POLARITIES} for asin in evidence}
+
+    prompt = build(chosen)
+    if count_tokens(prompt) > budget:
+        return build(None)
+
+    depth = max(
+        (len(sentences) for groups in evidence.values() for sentences in groups.values()),
+        default=0
+    )
+
+    for rank in range(depth):
+        for asin, groups in evidence.items():
+            for polarity in POLARITIES:
+                if rank >= len(groups[polarity]):
+                    continue
+
+                chosen[asin][polarity].append(groups[polarity][rank])
+                candidate = build(chosen)
+
+                if count_tokens(candidate) <= budget:
+                    prompt = candidate
+                else:
+                    chosen[asin][polarity].pop()
+
+    return prompt
+
+
+def format_evidence(sentences: dict, indent: str = "  ") -> str:
+    """
+    Quote a product's evidence as ``+`` (positive) and
+    ``-`` (negative) lines for plain-text prompts.
+    """
+
+    lines = [f'{indent}+ "{s}"' for s in sentences["positive"]]
+    lines += [f'{indent}- "{s}"' for s in sentences["negative"]]
+
+    return "\n".join(lines)
+
+
+# =====================================================
+# PROMPT LOGGING
+# =====================================================
+
+def log_prompt(
+    generator: str,
+    cluster_id,
+    prompt_tokens: int,
+    baseline_tokens: int,
+    seconds: float,
+    completion_tokens: int = None,
+    combined_text_tokens: int = None
+) -> dict:
+    """
+    Record one report's prompt size and generation latency.
+
+    ``baseline_tokens`` is the same prompt without evidence
+    (numbers only); ``combined_text_tokens`` what sending the
+    products' full ``combined_text`` would have cost.
+    """
+
+    entry = {
+        "generator": generator,
+        "cluster": int(cluster_id),
+        "prompt_tokens": int(prompt_tokens),
+        "baseline_prompt_tokens": int(baseline_tokens),
+        "evidence_tokens": int(prompt_tokens - baseline_tokens),
+        "completion_tokens": completion_tokens,
+        "combined_text_tokens": combined_text_tokens,
+        "seconds": round(seconds, 3),
+    }
+
+    print(
+        f"Cluster {cluster_id} prompt: {prompt_tokens} tokens "
+        f"(without evidence {baseline_tokens}"
+        + (f", full combined_text {combined_text_tokens}" if combined_text_tokens else "")
+        + f"), generated in {seconds:.2f}s"
+    )
+
+    with _prompt_lock:
+        _prompt_log.append(entry)
+
+    return entry
+
+
+def prompt_log(reset: bool = False) -> list:
+    """
+    Logged prompt entries (optionally clearing the log).
+    """
+
+    with _prompt_lock:
+        entries = list(_prompt_log)
+        if reset:
+            _prompt_log.clear()
+
+    return entries
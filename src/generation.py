@@ -4,27 +4,56 @@ Stable implementation using AutoModelForSeq2SeqLM.
 """
 
 import os
-import torch
+import time
 import pandas as pd
-from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
-from src.config import GENERATION_MODEL
+from src import profiling
+from src.config import GENERATION_MODEL, PROMPT_TOKEN_BUDGET
+from src.evidence import (
+    estimate_tokens,
+    evidence_for,
+    fit_evidence,
+    format_evidence,
+    log_prompt,
+    prompt_log
+)
+from src.model_registry import get_model
 
 PROCESSED_DIR = "data/processed"
 
 
-def load_generation_model():
+def build_generation_model():
+    from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
+
     tokenizer = AutoTokenizer.from_pretrained(GENERATION_MODEL)
     model = AutoModelForSeq2SeqLM.from_pretrained(GENERATION_MODEL)
     return tokenizer, model
 
 
+def warm_up_generation_model(tokenizer_and_model) -> None:
+    import torch
+
+    tokenizer, model = tokenizer_and_model
+    inputs = tokenizer("Warm-up prompt.", return_tensors="pt")
+
+    with torch.no_grad():
+        model.generate(**inputs, max_new_tokens=1)
+
+
+def load_generation_model():
+    """
+    Shared (tokenizer, model) pair, loaded once per process.
+    """
+    return get_model("generation")
+
+
 def generate_text(tokenizer, model, prompt: str) -> str:
+    import torch
 
     inputs = tokenizer(
         prompt,
         return_tensors="pt",
         truncation=True,
-        max_length=512
+        max_length=PROMPT_TOKEN_BUDGET
     )
 
     with torch.no_grad():
@@ -40,7 +69,21 @@ def generate_text(tokenizer, model, prompt: str) -> str:
     )
 
 
-def build_prompt(cluster_id: int, cluster_df: pd.DataFrame) -> str:
+def build_prompt(
+    cluster_id: int,
+    cluster_df: pd.DataFrame,
+    evidence_df: pd.DataFrame = None,
+    count_tokens=estimate_tokens,
+    budget: int = PROMPT_TOKEN_BUDGET
+) -> str:
+    """
+    Report prompt for one cluster.
+
+    With ``evidence_df``, quotes as many selected review
+    sentences as keep the whole prompt within ``budget``
+    tokens (as counted by ``count_tokens``, the generator's
+    tokenizer in ``generate_reports``).
+    """
 
     top3 = cluster_df.sort_values("cluster_rank").head(3)
     worst = cluster_df.sort_values(
@@ -48,6 +91,31 @@ def build_prompt(cluster_id: int, cluster_df: pd.DataFrame) -> str:
         ascending=False
     ).head(1)
 
+    if evidence_df is None:
+        return _render_prompt(cluster_id, top3, worst, None)
+
+    # Selected review sentences (see src/evidence.py)
+    evidence = evidence_for(
+        evidence_df,
+        list(top3["asin"]) + list(worst["asin"])
+    )
+
+    return fit_evidence(
+        lambda chosen: _render_prompt(cluster_id, top3, worst, chosen),
+        evidence,
+        count_tokens,
+        budget
+    )
+
+
+def _render_prompt(cluster_id, top3, worst, evidence) -> str:
+
+    def evidence_lines(asin):
+        if evidence is None:
+            return ""
+        lines = format_evidence(evidence[asin])
+        return f"{lines}\n" if lines else ""
+
     product_block = ""
     for _, row in top3.iterrows():
         product_block += (
@@ -55,7 +123,7 @@ def build_prompt(cluster_id: int, cluster_df: pd.DataFrame) -> str:
             f"Score: {round(row['final_score'], 3)} | "
             f"Reviews: {row['review_count']} | "
             f"Avg Rating: {round(row['avg_rating'], 2)}\n"
-        )
+        ) + evidence_lines(row["asin"])
 
     worst_block = ""
     for _, row in worst.iterrows():
@@ -63,6 +131,16 @@ def build_prompt(cluster_id: int, cluster_df: pd.DataFrame) -> str:
             f"ASIN: {row['asin']} | "
             f"Score: {round(row['final_score'], 3)} | "
             f"Negative Ratio: {round(row['negative_ratio'], 2)}\n"
+        ) + evidence_lines(row["asin"])
+
+    evidence_note = ""
+    if evidence is not None and any(
+        sentences for groups in evidence.values() for sentences in groups.values()
+    ):
+        evidence_note = (
+            "\nQuoted lines are customer review sentences "
+            "(+ positive, - negative). Base strengths and "
+            "weaknesses on them.\n"
         )
 
     prompt = f"""
@@ -77,7 +155,7 @@ Top 3 Products:
 
 Worst Product:
 {worst_block}
-
+{evidence_note}
 Write two clearly labeled sections:
 
 SECTION 1 — Executive Brief (bullet points, concise)
@@ -90,11 +168,17 @@ Generate the full report now.
     return prompt.strip()
 
 
-def generate_reports(ranked_df: pd.DataFrame):
+def generate_reports(ranked_df: pd.DataFrame, evidence_df: pd.DataFrame = None):
 
     print("\nGenerating AI reports...")
 
+    prompt_log(reset=True)
+
     tokenizer, model = load_generation_model()
+
+    def count_tokens(text):
+        return len(tokenizer(text).input_ids)
+
     cluster_ids = sorted(ranked_df["cluster"].unique())
 
     all_reports = []
@@ -105,8 +189,19 @@ def generate_reports(ranked_df: pd.DataFrame):
             ranked_df["cluster"] == cluster_id
         ]
 
-        prompt = build_prompt(cluster_id, cluster_df)
+        prompt = build_prompt(cluster_id, cluster_df, evidence_df, count_tokens)
+
+        start = time.perf_counter()
         output = generate_text(tokenizer, model, prompt)
+        seconds = time.perf_counter() - start
+
+        log_prompt(
+            "local",
+            cluster_id,
+            count_tokens(prompt),
+            count_tokens(build_prompt(cluster_id, cluster_df)),
+            seconds
+        )
 
         report_text = f"""
 ====================================
@@ -129,4 +224,6 @@ CATEGORY {cluster_id} REPORT
     ) as f:
         f.writelines(all_reports)
 
-    print("Saved generated_reports.txt")
\ No newline at end of file
+    print("Saved generated_reports.txt")
+
+    profiling.add_section("prompts", prompt_log())
\ No newline at end of file
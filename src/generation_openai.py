@@ -1,7 +1,17 @@
 import os
 import json
+import time
 import pandas as pd
 from openai import OpenAI
+from src import profiling
+from src.evidence import estimate_tokens, evidence_for, log_prompt, prompt_log
+from src.profiling import instrument
+
+PROCESSED_DIR = "data/processed"
+
+# Bootstrap uncertainty columns added by the rank stage
+# (see src/uncertainty.py); included in the prompt when present.
+UNCERTAINTY_COLUMNS = ["score_low", "score_high", "p_rank1"]
 
 
 # ================================
@@ -44,33 +54,65 @@ def convert_numpy(obj):
 # REPORT GENERATION
 # ================================
 
-def generate_report(cluster_id, cluster_df):
+def select_report_products(cluster_df):
     """
-    Generates executive + blog-style report
-    for a specific product cluster.
+    Top 3 products and the worst product (lowest final score).
     """
 
-    client = get_openai_client()
-
     # Sort cluster
     cluster_df = cluster_df.sort_values("cluster_rank")
 
-    # Top 3 products
-    top_products = cluster_df.head(3)
+    return cluster_df.head(3), cluster_df.sort_values("final_score").head(1)
+
 
-    # Worst product (lowest final score)
-    worst_product = cluster_df.sort_values("final_score").head(1)
+def build_report_prompt(cluster_id, cluster_df, evidence_df=None):
+    """
+    Builds the report prompt for a product cluster.
+
+    With ``evidence_df`` (see src/evidence.py), each product
+    carries its selected positive / negative review sentences.
+    """
+
+    top_products, worst_product = select_report_products(cluster_df)
+
+    columns = ["asin", "final_score", "review_count", "avg_rating", "negative_ratio"]
+    uncertainty_columns = [
+        col for col in UNCERTAINTY_COLUMNS if col in cluster_df.columns
+    ]
+
+    top_records = top_products[
+        columns + uncertainty_columns
+    ].map(convert_numpy).to_dict(orient="records")
+    worst_record = worst_product[
+        columns + uncertainty_columns
+    ].map(convert_numpy).to_dict(orient="records")[0]
+
+    if evidence_df is not None:
+        evidence = evidence_for(
+            evidence_df,
+            [record["asin"] for record in top_records + [worst_record]]
+        )
+        for record in top_records + [worst_record]:
+            record["review_evidence"] = evidence[record["asin"]]
 
     context = {
         "cluster_id": int(cluster_id),
-        "top_products": top_products[
-            ["asin", "final_score", "review_count", "avg_rating", "negative_ratio"]
-        ].applymap(convert_numpy).to_dict(orient="records"),
-        "worst_product": worst_product[
-            ["asin", "final_score", "review_count", "avg_rating", "negative_ratio"]
-        ].applymap(convert_numpy).to_dict(orient="records")[0],
+        "top_products": top_records,
+        "worst_product": worst_record,
     }
 
+    uncertainty_requirement = (
+        "- Use score_low/score_high (90% interval) and p_rank1 "
+        "(chance of ranking #1) to say how certain each ranking is\n"
+        if uncertainty_columns else ""
+    )
+
+    evidence_requirement = (
+        "- Base strengths and weaknesses on the review_evidence quotes; "
+        "do not invent product features\n"
+        if evidence_df is not None else ""
+    )
+
     prompt = f"""
 You are an AI business analyst.
 
@@ -88,9 +130,25 @@ Requirements:
 - Compare top 3 products clearly
 - Provide buying guidance
 - Explain why worst product should be avoided
-- Professional corporate tone
+{uncertainty_requirement}{evidence_requirement}- Professional corporate tone
 """
 
+    return prompt
+
+
+@instrument()
+def generate_report(cluster_id, cluster_df, evidence_df=None):
+    """
+    Generates executive + blog-style report
+    for a specific product cluster.
+    """
+
+    client = get_openai_client()
+
+    prompt = build_report_prompt(cluster_id, cluster_df, evidence_df)
+
+    start = time.perf_counter()
+
     response = client.chat.completions.create(
         model="gpt-4o-mini",
         messages=[
@@ -101,6 +159,33 @@ Requirements:
         max_tokens=900
     )
 
+    seconds = time.perf_counter() - start
+
+    # Billed counts from the API when reported. The baseline
+    # (same prompt without evidence) subtracts the estimated
+    # size of the evidence.
+    usage = getattr(response, "usage", None)
+    prompt_tokens = getattr(usage, "prompt_tokens", None) or estimate_tokens(prompt)
+    baseline_tokens = prompt_tokens - (
+        estimate_tokens(prompt) -
+        estimate_tokens(build_report_prompt(cluster_id, cluster_df))
+    )
+
+    reported = pd.concat(select_report_products(cluster_df))
+
+    log_prompt(
+        "openai",
+        cluster_id,
+        prompt_tokens,
+        baseline_tokens,
+        seconds,
+        completion_tokens=getattr(usage, "completion_tokens", None),
+        combined_text_tokens=(
+            int(reported["combined_text"].astype(str).map(estimate_tokens).sum())
+            if "combined_text" in reported.columns else None
+        )
+    )
+
     return response.choices[0].message.content
 
 
@@ -108,7 +193,7 @@ Requirements:
 # BULK GENERATION (Optional CLI use)
 # ================================
 
-def generate_reports(ranked_df):
+def generate_reports(ranked_df, evidence_df=None):
     """
     Generates reports for all clusters.
     Used in main.py pipeline.
@@ -116,6 +201,8 @@ def generate_reports(ranked_df):
 
     print("\nGenerating AI reports via OpenAI...")
 
+    prompt_log(reset=True)
+
     clusters = sorted(ranked_df["cluster"].unique())
 
     full_output = ""
@@ -125,7 +212,7 @@ def generate_reports(ranked_df):
 
         print(f"Generating report for cluster {cluster_id}...")
 
-        report = generate_report(cluster_id, cluster_df)
+        report = generate_report(cluster_id, cluster_df, evidence_df)
 
         full_output += (
             "\n====================================\n"
@@ -134,11 +221,14 @@ def generate_reports(ranked_df):
             f"{report}\n\n"
         )
 
-    output_path = "data/processed/generated_reports.txt"
+    os.makedirs(PROCESSED_DIR, exist_ok=True)
+    output_path = f"{PROCESSED_DIR}/generated_reports.txt"
 
     with open(output_path, "w", encoding="utf-8") as f:
         f.write(full_output)
 
     print("Saved generated_reports.txt")
 
+    profiling.add_section("prompts", prompt_log())
+
     return full_output
\ No newline at end of file
@@ -0,0 +1,232 @@
+"""
+Process-wide model registry.
+
+Loads each configured model once per process and hands out
+the shared instance to every caller (and thread), so a
+long-lived worker running the pipeline several times a day
+pays model load costs only once.
+
+- Lazy: a model is built on first ``get_model`` call.
+- Thread-safe: concurrent first calls wait for one load.
+- Warm-up: optional tiny inference right after loading.
+- Memory-aware: least recently used models are evicted when
+  the estimated total exceeds ``MODEL_MEMORY_BUDGET_MB``.
+- Metrics: load time, warm-up time, hits, misses, evictions.
+
+Shared models are used for inference only; callers must not
+mutate them.
+"""
+
+import importlib
+import threading
+import time
+from collections import OrderedDict
+
+import src.config as config
+
+# name -> (builder "module:function", config attribute with the model id,
+#          warm-up "module:function" or None)
+MODEL_SPECS = {
+    "sentiment": (
+        "src.sentiment:build_sentiment_model",
+        "SENTIMENT_MODEL",
+        "src.sentiment:warm_up_sentiment_model",
+    ),
+    "embedding": (
+        "src.embeddings:build_embedding_model",
+        "EMBEDDING_MODEL",
+        "src.embeddings:warm_up_embedding_model",
+    ),
+    "generation": (
+        "src.generation:build_generation_model",
+        "GENERATION_MODEL",
+        "src.generation:warm_up_generation_model",
+    ),
+}
+
+_lock = threading.Lock()
+_load_locks = {}
+_models = OrderedDict()  # key -> entry, least recently used first
+_stats = {}
+
+
+def _resolve(path: str):
+    module_name, func_name = path.split(":")
+    return getattr(importlib.import_module(module_name), func_name)
+
+
+def _model_key(name: str) -> str:
+    if name not in MODEL_SPECS:
+        raise KeyError(
+            f"Unknown model '{name}'. Expected one of {list(MODEL_SPECS)}."
+        )
+
+    _, config_attr, _ = MODEL_SPECS[name]
+    return f"{name}:{getattr(config, config_attr)}"
+
+
+def _stats_for(key: str) -> dict:
+    return _stats.setdefault(key, {
+        "hits": 0,
+        "misses": 0,
+        "loads": 0,
+        "evictions": 0,
+        "load_seconds": 0.0,
+        "warmup_seconds": 0.0,
+        "size_mb": None,
+    })
+
+
+def estimate_size_mb(model):
+    """
+    Estimate a model's memory from its torch parameters and buffers.
+
+    Handles plain ``nn.Module`` objects, Hugging Face pipelines
+    (``.model``) and ``(tokenizer, model)`` tuples. Returns None
+    if nothing measurable is found.
+    """
+
+    if isinstance(model, (tuple, list)):
+        sizes = [estimate_size_mb(part) for part in model]
+        sizes = [size for size in sizes if size is not None]
+        return sum(sizes) if sizes else None
+
+    module = getattr(model, "model", model)
+
+    if not hasattr(module, "parameters"):
+        return None
+
+    total = 0
+    for tensor in list(module.parameters()) + list(getattr(module, "buffers", list)()):
+        total += tensor.numel() * tensor.element_size()
+
+    return total / (1024 * 1024)
+
+
+def _evict_over_budget(keep: str) -> None:
+    """
+    Drop least recently used models until within budget.
+
+    Callers already holding an evicted model keep using it;
+    it is freed once their references go away.
+    """
+
+    budget = getattr(config, "MODEL_MEMORY_BUDGET_MB", None)
+    if budget is None:
+        return
+
+    def total():
+        return sum(entry["size_mb"] or 0 for entry in _models.values())
+
+    for key in list(_models):
+        if total() <= budget:
+            break
+        if key == keep:
+            continue
+
+        del _models[key]
+        _stats_for(key)["evictions"] += 1
+        print(f"Evicted model {key} (memory budget {budget} MB)")
+
+
+def get_model(name: str, warm_up: bool = None):
+    """
+    Return the shared instance of a configured model.
+
+    Args:
+        name: One of ``MODEL_SPECS`` ("sentiment", "embedding",
+            "generation").
+        warm_up: Run a tiny inference after loading. Defaults to
+            ``config.MODEL_WARMUP``.
+    """
+
+    key = _model_key(name)
+
+    with _lock:
+        entry = _models.get(key)
+        if entry is not None:
+            _models.move_to_end(key)
+            _stats_for(key)["hits"] += 1
+            return entry["model"]
+        load_lock = _load_locks.setdefault(key, threading.Lock())
+
+    # Only one thread loads a given model; others wait here
+    # and then find it in the registry.
+    with load_lock:
+        with _lock:
+            entry = _models.get(key)
+            if entry is not None:
+                _models.move_to_end(key)
+                _stats_for(key)["hits"] += 1
+                return entry["model"]
+            _stats_for(key)["misses"] += 1
+
+        builder_path, _, warmup_path = MODEL_SPECS[name]
+
+        print(f"Loading model {key}...")
+        start = time.perf_counter()
+        model = _resolve(builder_path)()
+        load_seconds = time.perf_counter() - start
+
+        if warm_up is None:
+            warm_up = getattr(config, "MODEL_WARMUP", False)
+
+        warmup_seconds = 0.0
+        if warm_up and warmup_path:
+            start = time.perf_counter()
+            _resolve(warmup_path)(model)
+            warmup_seconds = time.perf_counter() - start
+
+        size_mb = estimate_size_mb(model)
+
+        with _lock:
+            stats = _stats_for(key)
+            stats["loads"] += 1
+            stats["load_seconds"] += load_seconds
+            stats["warmup_seconds"] += warmup_seconds
+            stats["size_mb"] = None if size_mb is None else round(size_mb, 1)
+
+            _models[key] = {"model": model, "size_mb": size_mb}
+            _evict_over_budget(keep=key)
+
+        print(f"Loaded {key} in {load_seconds:.2f}s")
+
+        return model
+
+
+def warm_up_models(names=None) -> None:
+    """
+    Preload (and warm up) models, e.g. when a worker starts.
+    """
+
+    for name in names or MODEL_SPECS:
+        get_model(name, warm_up=True)
+
+
+def release_model(name: str = None) -> None:
+    """
+    Drop one model (or all models) from the registry.
+    """
+
+    with _lock:
+        if name is None:
+            _models.clear()
+            return
+        _models.pop(_model_key(name), None)
+
+
+def model_stats() -> dict:
+    """
+    Load-time and cache-hit metrics per model key.
+    """
+
+    with _lock:
+        return {
+            key: {
+                **stats,
+                "load_seconds": round(stats["load_seconds"], 3),
+                "warmup_seconds": round(stats["warmup_seconds"], 3),
+                "loaded": key in _models,
+            }
+            for key, stats in _stats.items()
+        }
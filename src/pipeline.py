@@ -0,0 +1,778 @@
+"""
+Pipeline runner module.
+
+Declares the pipeline phases as stages with explicit
+input and output artifacts, fingerprints each stage
+(code version + config values + input hashes) and
+skips stages whose cached outputs are still valid.
+"""
+
+import ast
+import hashlib
+import importlib.util
+import inspect
+import json
+import os
+import shutil
+import time
+from dataclasses import dataclass, field
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+import src.config as config
+from src import profiling
+
+PROCESSED_DIR = "data/processed"
+CACHE_DIR = f"{PROCESSED_DIR}/.pipeline_cache"
+MANIFEST_PATH = f"{CACHE_DIR}/manifest.json"
+
+
+@dataclass
+class Stage:
+    """
+    A pipeline phase with declared artifacts.
+
+    ``inputs`` and ``outputs`` are file names inside
+    ``PROCESSED_DIR``. ``config_keys`` name the values in
+    ``src/config.py`` the stage depends on and ``modules``
+    the source modules whose code defines its behaviour
+    (``module:function`` for a single top-level function).
+    """
+
+    name: str
+    func: Callable
+    inputs: tuple = ()
+    outputs: tuple = ()
+    config_keys: tuple = ()
+    modules: tuple = ()
+    description: str = ""
+
+
+@dataclass
+class StageResult:
+    name: str
+    status: str
+    seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    fingerprint: str = ""
+    outputs: dict = field(default_factory=dict)
+
+
+# =====================================================
+# ARTIFACT I/O
+# =====================================================
+
+def artifact_path(name: str) -> str:
+    return os.path.join(PROCESSED_DIR, name)
+
+
+def load_artifact(name: str):
+    """
+    Load an artifact from disk based on its extension.
+    """
+
+    path = artifact_path(name)
+
+    if not os.path.exists(path):
+        raise FileNotFoundError(
+            f"Required artifact '{name}' not found in {PROCESSED_DIR}. "
+            "Run the stage that produces it first."
+        )
+
+    if name.endswith(".csv"):
+        # round_trip: floats parse back to exactly the written value
+        return pd.read_csv(path, float_precision="round_trip")
+    if name.endswith(".npy"):
+        return np.load(path)
+    if name.endswith(".npz"):
+        with np.load(path) as arrays:
+            return dict(arrays)
+
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+class ArtifactStore(dict):
+    """
+    In-memory artifacts, loaded from disk on first access.
+
+    Binary artifacts (npy/npz) of stages that ran in this
+    process are handed over directly. CSV artifacts are always
+    read back from disk (see ``run_pipeline``); artifacts of
+    reused stages are read lazily.
+    """
+
+    def __missing__(self, name):
+        value = load_artifact(name)
+        self[name] = value
+        return value
+
+
+# =====================================================
+# STAGE DEFINITIONS
+# =====================================================
+
+# Stage modules are imported inside each runner so that only
+# the stages that actually execute pay for their dependencies
+# (transformers, torch, sentence-transformers, sklearn, openai).
+
+def _run_preprocess(store):
+    from src.preprocessing import preprocess
+
+    return {"clean_reviews.csv": preprocess()}
+
+
+def _run_sentiment(store):
+    from src.sentiment import evaluate_sentiment_model
+
+    evaluate_sentiment_model(store["clean_reviews.csv"])
+    return {}
+
+
+def _run_aggregate(store):
+    from src.aggregation import aggregate_products
+
+    return {"products.csv": aggregate_products(store["clean_reviews.csv"])}
+
+
+def _run_embed(store):
+    from src.embeddings import filter_products, generate_embeddings
+
+    product_df = filter_products(store["products.csv"])
+    return {"product_embeddings.npy": generate_embeddings(product_df)}
+
+
+def _run_cluster(store):
+    from src.clustering import perform_clustering
+    from src.embeddings import filter_products
+
+    product_df = filter_products(store["products.csv"])
+    clustered_df = perform_clustering(
+        product_df,
+        store["product_embeddings.npy"]
+    )
+    return {"clusters.csv": clustered_df}
+
+
+def _run_interpret(store):
+    from src.cluster_interpretation import interpret_clusters
+
+    interpret_clusters(store["clusters.csv"])
+    return {}
+
+
+def _run_index(store):
+    from src.review_search import build_review_index
+
+    build_review_index(store["clean_reviews.csv"], store["clusters.csv"])
+    return {}
+
+
+def _run_windows(store):
+    from src.windowed_metrics import build_window_metrics
+
+    metrics = build_window_metrics(store["clean_reviews.csv"])
+    return {"window_metrics.npz": metrics.to_arrays()}
+
+
+def _run_rank(store):
+    from src.ranking import (
+        compute_bayesian_score,
+        apply_sentiment_penalty,
+        compute_recency_weighted_score,
+        rank_within_clusters
+    )
+    from src.uncertainty import score_intervals
+    from src.windowed_metrics import WindowedMetrics
+
+    metrics = WindowedMetrics.from_arrays(store["window_metrics.npz"])
+
+    ranked_df = compute_bayesian_score(store["clusters.csv"].copy())
+    ranked_df = apply_sentiment_penalty(ranked_df)
+    ranked_df = compute_recency_weighted_score(ranked_df, metrics)
+    ranked_df = score_intervals(ranked_df, store["clean_reviews.csv"])
+    ranked_df = rank_within_clusters(ranked_df)
+    return {"ranked_products.csv": ranked_df}
+
+
+def _run_evidence(store):
+    from src.evidence import select_evidence
+
+    return {
+        "product_evidence.csv": select_evidence(
+            store["clean_reviews.csv"],
+            store["clusters.csv"]
+        )
+    }
+
+
+def _run_report(store):
+    from src.generation_openai import generate_reports
+
+    generate_reports(
+        store["ranked_products.csv"],
+        store["product_evidence.csv"]
+    )
+    return {}
+
+
+def _run_pdf(store):
+    from src.report_pdf import render_report_pdfs
+
+    render_report_pdfs(
+        store["ranked_products.csv"],
+        store["generated_reports.txt"]
+    )
+    return {}
+
+
+STAGES = [
+    Stage(
+        name="preprocess",
+        func=_run_preprocess,
+        outputs=("clean_reviews.csv",),
+        config_keys=("DATASET_SAMPLE_SIZE", "AUDIO_KEYWORDS"),
+        modules=("src.preprocessing",),
+        description="PHASE 2: PREPROCESSING"
+    ),
+    Stage(
+        name="sentiment",
+        func=_run_sentiment,
+        inputs=("clean_reviews.csv",),
+        outputs=("sentiment_evaluation_sample.csv",),
+        config_keys=("SENTIMENT_MODEL",),
+        modules=("src.sentiment",),
+        description="PHASE 2B: SENTIMENT EVALUATION"
+    ),
+    Stage(
+        name="aggregate",
+        func=_run_aggregate,
+        inputs=("clean_reviews.csv",),
+        outputs=("products.csv",),
+        modules=("src.aggregation",),
+        description="PHASE 3: PRODUCT AGGREGATION"
+    ),
+    Stage(
+        name="embed",
+        func=_run_embed,
+        inputs=("products.csv",),
+        outputs=("product_embeddings.npy",),
+        config_keys=("EMBEDDING_MODEL",),
+        modules=("src.embeddings",),
+        description="PHASE 4: EMBEDDING"
+    ),
+    Stage(
+        name="cluster",
+        func=_run_cluster,
+        inputs=("products.csv", "product_embeddings.npy"),
+        outputs=("clusters.csv",),
+        config_keys=("N_CLUSTERS", "RANDOM_STATE"),
+        modules=("src.clustering", "src.embeddings:filter_products"),
+        description="PHASE 4: CLUSTERING"
+    ),
+    Stage(
+        name="interpret",
+        func=_run_interpret,
+        inputs=("clusters.csv",),
+        outputs=("cluster_summary.txt",),
+        modules=("src.cluster_interpretation",),
+        description="PHASE 4B: CLUSTER INTERPRETATION"
+    ),
+    Stage(
+        name="index",
+        func=_run_index,
+        inputs=("clean_reviews.csv", "clusters.csv"),
+        outputs=("review_index.db",),
+        modules=("src.review_search",),
+        description="PHASE 4C: REVIEW SEARCH INDEX"
+    ),
+    Stage(
+        name="windows",
+        func=_run_windows,
+        inputs=("clean_reviews.csv",),
+        outputs=("window_metrics.npz", "product_windows.csv"),
+        config_keys=("WINDOW_BUCKET_DAYS", "WINDOW_DAYS"),
+        modules=("src.windowed_metrics",),
+        description="PHASE 5: TIME-WINDOWED METRICS"
+    ),
+    Stage(
+        name="rank",
+        func=_run_rank,
+        inputs=("clusters.csv", "window_metrics.npz", "clean_reviews.csv"),
+        outputs=("ranked_products.csv",),
+        config_keys=(
+            "RECENCY_HALF_LIFE_DAYS",
+            "BOOTSTRAP_RESAMPLES",
+            "BOOTSTRAP_CONFIDENCE",
+            "BOOTSTRAP_TOP_K",
+            "BOOTSTRAP_EXACT_MAX_REVIEWS",
+            "BOOTSTRAP_POOL_SIZE",
+            "RANDOM_STATE",
+        ),
+        modules=("src.ranking", "src.windowed_metrics", "src.uncertainty"),
+        description="PHASE 5: RANKING ENGINE"
+    ),
+    Stage(
+        name="evidence",
+        func=_run_evidence,
+        inputs=("clean_reviews.csv", "clusters.csv"),
+        outputs=("product_evidence.csv",),
+        config_keys=(
+            "EVIDENCE_TOKEN_BUDGET",
+            "EVIDENCE_MAX_SENTENCES",
+            "EVIDENCE_MIN_WORDS",
+            "EVIDENCE_MAX_WORDS",
+        ),
+        modules=("src.evidence",),
+        description="PHASE 5B: REVIEW EVIDENCE SELECTION"
+    ),
+    Stage(
+        name="report",
+        func=_run_report,
+        inputs=("ranked_products.csv", "product_evidence.csv"),
+        outputs=("generated_reports.txt",),
+        modules=("src.generation_openai", "src.evidence"),
+        description="PHASE 6: GENERATIVE REPORTING"
+    ),
+    Stage(
+        name="pdf",
+        func=_run_pdf,
+        inputs=("ranked_products.csv", "generated_reports.txt"),
+        outputs=tuple(
+            f"report_cluster_{cluster_id}.pdf"
+            for cluster_id in range(config.N_CLUSTERS)
+        ),
+        config_keys=("N_CLUSTERS", "CATEGORY_MAP"),
+        modules=("src.report_pdf",),
+        description="PHASE 6B: PDF REPORT RENDERING"
+    ),
+]
+
+STAGE_NAMES = [stage.name for stage in STAGES]
+
+
+# =====================================================
+# FINGERPRINTING
+# =====================================================
+
+def file_hash(path: str) -> str:
+    """
+    SHA-256 of a file's contents, read in 1 MB chunks.
+    """
+
+    digest = hashlib.sha256()
+
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def _module_source_hash(module_name: str) -> str:
+    """
+    Hash a module's source file without importing it.
+
+    ``module:function`` hashes just that top-level function
+    (or class), so a stage can depend on one helper without
+    re-running on every edit to the rest of its module.
+    """
+
+    module_name, _, func_name = module_name.partition(":")
+    spec = importlib.util.find_spec(module_name)
+
+    if spec is None or not spec.origin:
+        raise ValueError(f"Cannot locate source for module '{module_name}'.")
+
+    if not func_name:
+        return file_hash(spec.origin)
+
+    with open(spec.origin, "r", encoding="utf-8") as f:
+        source = f.read()
+
+    for node in ast.parse(source).body:
+        if isinstance(node, (ast.FunctionDef, ast.ClassDef)) and node.name == func_name:
+            segment = ast.get_source_segment(source, node)
+            return hashlib.sha256(segment.encode("utf-8")).hexdigest()
+
+    raise ValueError(f"Cannot find '{func_name}' in module '{module_name}'.")
+
+
+def _function_source(func) -> str:
+    try:
+        return inspect.getsource(func)
+    except (OSError, TypeError):
+        # Source unavailable (e.g. frozen or interactive code)
+        return func.__code__.co_code.hex()
+
+
+def stage_fingerprint(stage: Stage, input_hashes: dict) -> str:
+    """
+    Fingerprint a stage from its code, config values and inputs.
+    """
+
+    payload = {
+        "stage": stage.name,
+        "runner": _function_source(stage.func),
+        "modules": {
+            module: _module_source_hash(module)
+            for module in stage.modules
+        },
+        "config": {
+            key: getattr(config, key)
+            for key in stage.config_keys
+        },
+        "inputs": {
+            name: input_hashes[name]
+            for name in stage.inputs
+        },
+    }
+
+    encoded = json.dumps(payload, sort_keys=True, default=repr)
+
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+# =====================================================
+# CACHE MANIFEST
+# =====================================================
+
+def load_manifest() -> dict:
+    """
+    Load the cache manifest.
+
+    ``stages`` maps each stage to its last fingerprint (and
+    the recent ones still cached, newest first, in ``history``)
+    and ``objects`` maps fingerprints to cached output hashes.
+    """
+
+    if not os.path.exists(MANIFEST_PATH):
+        return {"stages": {}, "objects": {}}
+
+    with open(MANIFEST_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_manifest(manifest: dict) -> None:
+    os.makedirs(CACHE_DIR, exist_ok=True)
+
+    tmp_path = f"{MANIFEST_PATH}.tmp"
+
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+    os.replace(tmp_path, MANIFEST_PATH)
+
+
+def _object_dir(fingerprint: str) -> str:
+    return os.path.join(CACHE_DIR, "objects", fingerprint)
+
+
+def prune_manifest(manifest: dict, keep: int = None) -> set:
+    """
+    Keep the ``keep`` most recent fingerprints per stage
+    (default ``PIPELINE_CACHE_KEEP``) and drop every other
+    ``objects`` entry.
+
+    Returns:
+        set: Fingerprints still cached.
+    """
+
+    keep = keep or config.PIPELINE_CACHE_KEEP
+    kept = set()
+
+    for entry in manifest["stages"].values():
+        history = entry.get("history") or [entry["fingerprint"]]
+        entry["history"] = history[:keep]
+        kept.update(entry["history"])
+
+    for fingerprint in list(manifest["objects"]):
+        if fingerprint not in kept:
+            del manifest["objects"][fingerprint]
+
+    return kept
+
+
+def remove_stale_objects(kept: set) -> int:
+    """
+    Delete cached output directories not in ``kept``.
+
+    Run after the pruned manifest is saved, so a crash in
+    between only leaves unreferenced directories behind
+    (removed on the next run).
+    """
+
+    objects_dir = os.path.join(CACHE_DIR, "objects")
+
+    if not os.path.isdir(objects_dir):
+        return 0
+
+    stale = [name for name in os.listdir(objects_dir) if name not in kept]
+
+    for name in stale:
+        shutil.rmtree(os.path.join(objects_dir, name), ignore_errors=True)
+
+    return len(stale)
+
+
+def _outputs_current(stage: Stage, recorded: dict) -> bool:
+    """
+    True if every output on disk matches its recorded hash.
+    """
+
+    for name in stage.outputs:
+        path = artifact_path(name)
+        if not os.path.exists(path) or file_hash(path) != recorded.get(name):
+            return False
+    return True
+
+
+def _restore_outputs(stage: Stage, fingerprint: str, recorded: dict) -> bool:
+    """
+    Copy a stage's cached outputs back into ``PROCESSED_DIR``.
+    """
+
+    object_dir = _object_dir(fingerprint)
+
+    for name in stage.outputs:
+        cached = os.path.join(object_dir, name)
+        if not os.path.exists(cached) or file_hash(cached) != recorded.get(name):
+            return False
+
+    for name in stage.outputs:
+        shutil.copy2(os.path.join(object_dir, name), artifact_path(name))
+
+    return True
+
+
+def _store_outputs(stage: Stage, fingerprint: str) -> dict:
+    """
+    Hash a stage's fresh outputs and copy them into the cache.
+
+    Outputs are copied rather than hard-linked because the
+    pipeline rewrites artifacts in place on the next run.
+    """
+
+    object_dir = _object_dir(fingerprint)
+    os.makedirs(object_dir, exist_ok=True)
+
+    hashes = {}
+
+    for name in stage.outputs:
+        path = artifact_path(name)
+
+        if not os.path.exists(path):
+            raise RuntimeError(
+                f"Stage '{stage.name}' did not produce declared output '{name}'."
+            )
+
+        hashes[name] = file_hash(path)
+        shutil.copy2(path, os.path.join(object_dir, name))
+
+    return hashes
+
+
+# =====================================================
+# RUNNER
+# =====================================================
+
+def select_stages(
+    from_stage: str = None,
+    only: list = None,
+    stages: list = None
+) -> set:
+    """
+    Resolve ``--from-stage`` / ``--only`` into the stages to execute.
+    """
+
+    for name in [from_stage, *(only or []), *(stages or [])]:
+        if name is not None and name not in STAGE_NAMES:
+            raise ValueError(
+                f"Unknown stage '{name}'. Expected one of {STAGE_NAMES}."
+            )
+
+    if only:
+        return set(only)
+
+    if stages:
+        return set(stages)
+
+    if from_stage:
+        return set(STAGE_NAMES[STAGE_NAMES.index(from_stage):])
+
+    return set(STAGE_NAMES)
+
+
+def _count_rows(store: ArtifactStore, names: tuple):
+    counts = [
+        profiling.count_rows(store[name])
+        for name in names
+        if name in store
+    ]
+    counts = [count for count in counts if count is not None]
+    return sum(counts) if counts else None
+
+
+def run_pipeline(
+    from_stage: str = None,
+    only: list = None,
+    force: bool = False,
+    stages: list = None
+) -> list:
+    """
+    Run the pipeline, reusing cached stage outputs where valid.
+
+    Args:
+        from_stage: Start at this stage; earlier stages are not
+            executed and their artifacts are read from disk.
+            Selected stages always re-run.
+        only: Run just these stages (always re-run).
+        force: Ignore the cache and re-run every selected stage.
+        stages: Run just these stages, reusing valid cached
+            outputs (used by the CLI subcommands).
+
+    Returns:
+        list[StageResult]: Status and timing per stage.
+    """
+
+    selected = select_stages(from_stage, only, stages)
+    forced = force or bool(from_stage) or bool(only)
+
+    manifest = load_manifest()
+    store = ArtifactStore()
+    input_hashes = {}
+    results = []
+
+    for stage in STAGES:
+
+        if stage.name not in selected:
+            # Upstream artifact: trust what is on disk.
+            for name in stage.outputs:
+                path = artifact_path(name)
+                if os.path.exists(path):
+                    input_hashes[name] = file_hash(path)
+            results.append(StageResult(stage.name, "skipped"))
+            profiling.record_skipped(stage.name, "skipped")
+            continue
+
+        missing = [name for name in stage.inputs if name not in input_hashes]
+        if missing:
+            raise FileNotFoundError(
+                f"Stage '{stage.name}' needs {missing}, which are missing "
+                f"from {PROCESSED_DIR}. Run the upstream stages first."
+            )
+
+        fingerprint = stage_fingerprint(stage, input_hashes)
+        entry = manifest["stages"].get(stage.name, {})
+        cached = manifest["objects"].get(fingerprint)
+
+        start = time.perf_counter()
+        cpu_start = time.process_time()
+        status = None
+
+        if not forced and cached is not None:
+            if entry.get("fingerprint") == fingerprint and \
+                    _outputs_current(stage, cached):
+                status = "reused"
+            elif _restore_outputs(stage, fingerprint, cached):
+                status = "restored"
+
+        if status is None:
+            print(f"\n=== {stage.description or stage.name.upper()} ===")
+
+            with profiling.stage(stage.name) as record:
+                produced = stage.func(store)
+                store.update(produced)
+                record["rows_in"] = _count_rows(store, stage.inputs)
+                record["rows_out"] = _count_rows(store, stage.outputs)
+
+            # A DataFrame does not survive the CSV round trip exactly
+            # (dtypes, float formatting), so downstream stages read
+            # CSV artifacts back from disk: they see the same input
+            # whether the upstream stage ran now or in an earlier run,
+            # and their outputs hash the same either way.
+            for name in stage.outputs:
+                if name.endswith(".csv"):
+                    store.pop(name, None)
+
+            cached = _store_outputs(stage, fingerprint)
+            manifest["objects"][fingerprint] = cached
+            status = "ran"
+
+        else:
+            profiling.record_skipped(stage.name, status)
+
+        input_hashes.update(cached)
+
+        previous = entry.get("history") or [entry.get("fingerprint")]
+        history = [fingerprint] + [
+            older for older in previous
+            if older is not None and older != fingerprint
+        ]
+
+        manifest["stages"][stage.name] = {
+            "fingerprint": fingerprint,
+            "history": history,
+            "outputs": cached,
+            "updated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        save_manifest(manifest)
+
+        results.append(
+            StageResult(
+                stage.name,
+                status,
+                seconds=time.perf_counter() - start,
+                cpu_seconds=time.process_time() - cpu_start,
+                fingerprint=fingerprint,
+                outputs=cached
+            )
+        )
+
+    # Every new fingerprint stores a full copy of its outputs
+    # (corpus, search index, ...): keep only recent versions.
+    kept = prune_manifest(manifest)
+    save_manifest(manifest)
+    removed = remove_stale_objects(kept)
+
+    if removed:
+        print(f"Pruned {removed} stale cache entr{'y' if removed == 1 else 'ies'}")
+
+    return results
+
+
+def print_summary(results: list) -> None:
+    """
+    Print which stages ran or were reused, with timings.
+
+    Stages run one after another, so each stage's share of
+    the wall-clock is also its utilization.
+    """
+
+    total = sum(result.seconds for result in results)
+    cpu = sum(result.cpu_seconds for result in results)
+
+    print("\n=== PIPELINE SUMMARY ===")
+    print(f"{'Stage':<12}{'Status':<10}{'Seconds':>10}{'Util':>8}")
+
+    for result in results:
+        if result.status == "skipped":
+            print(f"{result.name:<12}{result.status:<10}{'-':>10}{'-':>8}")
+            continue
+
+        share = result.seconds / total if total else 0.0
+        print(
+            f"{result.name:<12}{result.status:<10}"
+            f"{result.seconds:>10.2f}{share:>8.0%}"
+        )
+
+    ran = sum(result.status == "ran" for result in results)
+    reused = sum(result.status in ("reused", "restored") for result in results)
+
+    print(f"\n{ran} stage(s) ran, {reused} reused")
+    print(
+        f"Wall-clock {total:.2f}s, CPU {cpu:.2f}s "
+        f"(CPU/wall {cpu / total if total else 0.0:.0%})"
+    )
@@ -10,12 +10,30 @@ and saves cleaned dataset to disk.
 
 import os
 import pandas as pd
-from datasets import load_dataset
 from src.config import DATASET_SAMPLE_SIZE, AUDIO_KEYWORDS
+from src.profiling import instrument
 
 PROCESSED_DIR = "data/processed"
 
+REVIEW_COLUMNS = ["asin", "title", "rating", "text", "timestamp"]
 
+
+def filter_audio_reviews(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Keep complete review rows that mention an audio keyword.
+
+    Works on the full dataset or on a single streamed batch.
+    """
+
+    # ✅ PRESERVE PRODUCT TITLE (and review timestamp for windowed metrics)
+    df = df[REVIEW_COLUMNS].dropna()
+
+    keyword_pattern = "|".join(AUDIO_KEYWORDS)
+
+    return df[df["text"].str.lower().str.contains(keyword_pattern)]
+
+
+@instrument()
 def load_and_filter_data() -> pd.DataFrame:
     """
     Load Amazon Electronics dataset and filter audio-related reviews.
@@ -24,6 +42,10 @@ def load_and_filter_data() -> pd.DataFrame:
         pd.DataFrame: Filtered review-level dataset.
     """
 
+    # Imported here so filtering and labelling work without
+    # the datasets package (e.g. the offline benchmarks).
+    from datasets import load_dataset
+
     print("Loading Amazon Electronics dataset...")
 
     dataset = load_dataset(
@@ -35,20 +57,41 @@ def load_and_filter_data() -> pd.DataFrame:
 
     df = pd.DataFrame(dataset)
 
-    # ✅ PRESERVE PRODUCT TITLE
-    df = df[["asin", "title", "rating", "text"]].dropna()
-
     print(f"Initial dataset size: {len(df)}")
 
     # Filter for audio-related keywords
-    keyword_pattern = "|".join(AUDIO_KEYWORDS)
-    df = df[df["text"].str.lower().str.contains(keyword_pattern)]
+    df = filter_audio_reviews(df)
 
     print(f"Filtered audio-related reviews: {len(df)}")
 
     return df.reset_index(drop=True)
 
 
+def iter_review_batches(batch_size: int = 2000):
+    """
+    Stream the same review sample as ``load_and_filter_data``
+    in unfiltered batches, without materializing the dataset.
+
+    Yields:
+        pd.DataFrame: Raw review batch.
+    """
+
+    from datasets import load_dataset
+
+    dataset = load_dataset(
+        "McAuley-Lab/Amazon-Reviews-2023",
+        "raw_review_Electronics",
+        split="full",
+        streaming=True,
+        trust_remote_code=True
+    )
+
+    dataset = dataset.select_columns(REVIEW_COLUMNS).take(DATASET_SAMPLE_SIZE)
+
+    for batch in dataset.iter(batch_size=batch_size):
+        yield pd.DataFrame(batch)
+
+
 def map_sentiment_label(rating: int) -> str:
     """
     Map star rating to binary sentiment.
@@ -62,6 +105,16 @@ def map_sentiment_label(rating: int) -> str:
     return "positive"
 
 
+def label_sentiment(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add the star-based ``sentiment_label`` column.
+    """
+
+    df["sentiment_label"] = df["rating"].apply(map_sentiment_label)
+
+    return df
+
+
 def preprocess() -> pd.DataFrame:
     """
     Full preprocessing pipeline.
@@ -72,7 +125,7 @@ def preprocess() -> pd.DataFrame:
 
     df = load_and_filter_data()
 
-    df["sentiment_label"] = df["rating"].apply(map_sentiment_label)
+    df = label_sentiment(df)
 
     os.makedirs(PROCESSED_DIR, exist_ok=True)
     df.to_csv(f"{PROCESSED_DIR}/clean_reviews.csv", index=False)
@@ -0,0 +1,410 @@
+"""
+Profiling module.
+
+Records wall time, CPU time, peak RSS, rows in/out and
+throughput for every pipeline stage and for the hot
+functions inside them, optionally dumps cProfile stats,
+and writes a machine-readable JSON run report.
+
+Usage:
+    with stage("cluster") as record:
+        ...
+        record["rows_out"] = len(df)
+
+    @instrument()
+    def generate_embeddings(product_df): ...
+
+Compare two run reports:
+    python -m src.profiling diff old.json new.json
+"""
+
+import cProfile
+import functools
+import json
+import os
+import platform
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+PROCESSED_DIR = "data/processed"
+REPORT_PATH = f"{PROCESSED_DIR}/run_report.json"
+PROFILE_DIR = f"{PROCESSED_DIR}/profiles"
+
+_lock = threading.Lock()
+_local = threading.local()
+
+_run = {
+    "records": [],
+    "sections": {},
+    "profile": False,
+    "profile_dir": None,
+    "started_at": None,
+    "start_time": None,
+}
+
+
+# =====================================================
+# MEMORY
+# =====================================================
+
+def _read_status_kb(field: str):
+    try:
+        with open("/proc/self/status", "r", encoding="ascii") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+    return None
+
+
+def reset_peak_rss() -> bool:
+    """
+    Reset the kernel's peak-RSS high-water mark (Linux only).
+
+    Returns:
+        bool: True if per-stage peaks can be measured.
+    """
+
+    try:
+        with open("/proc/self/clear_refs", "w", encoding="ascii") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss_mb():
+    """
+    Peak resident set size in MB (since last reset on Linux,
+    since process start elsewhere). None if unavailable.
+    """
+
+    hwm_kb = _read_status_kb("VmHWM")
+    if hwm_kb is not None:
+        return hwm_kb / 1024
+
+    if resource is None:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # ru_maxrss is bytes on macOS, kilobytes on Linux
+    if sys.platform == "darwin":
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+def count_rows(obj):
+    """
+    Row count of a DataFrame / array / list, else None.
+    """
+
+    if obj is None or isinstance(obj, (str, bytes, dict)):
+        return None
+    if hasattr(obj, "shape") and getattr(obj, "shape", None):
+        return int(obj.shape[0])
+    if isinstance(obj, (list, tuple)):
+        return len(obj)
+    return None
+
+
+# =====================================================
+# RECORDING
+# =====================================================
+
+def start_run(profile: bool = False, profile_dir: str = PROFILE_DIR) -> None:
+    """
+    Reset collected records and start a new run.
+
+    Args:
+        profile: Dump cProfile stats per stage into ``profile_dir``.
+    """
+
+    with _lock:
+        _run["records"] = []
+        _run["sections"] = {}
+        _run["profile"] = profile
+        _run["started_at"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+        _run["start_time"] = time.perf_counter()
+        _run["profile_dir"] = (
+            os.path.join(profile_dir, time.strftime("%Y%m%d-%H%M%S"))
+            if profile else None
+        )
+
+
+def _stack():
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+    return _local.stack
+
+
+@contextmanager
+def stage(name: str, rows_in: int = None, kind: str = "stage"):
+    """
+    Measure a block of work.
+
+    Yields a record dict; set ``rows_in`` / ``rows_out`` (or any
+    extra key) on it inside the block. Blocks nested in the same
+    thread are attached to the enclosing record as ``functions``.
+    """
+
+    record = {
+        "name": name,
+        "kind": kind,
+        "rows_in": rows_in,
+        "rows_out": None,
+    }
+
+    stack = _stack()
+    is_top = not stack
+
+    # Process-wide counters (CPU of library worker threads, peak
+    # RSS resets) are only meaningful for top-level stages on the
+    # main thread; everything else is measured per thread.
+    process_wide = is_top and threading.current_thread() is threading.main_thread()
+    cpu_clock = time.process_time if process_wide else time.thread_time
+
+    if is_top:
+        record["functions"] = []
+    if process_wide:
+        record["peak_rss_per_stage"] = reset_peak_rss()
+
+    profiler = None
+    if is_top and _run["profile"] and _run["profile_dir"]:
+        profiler = cProfile.Profile()
+
+    stack.append(record)
+
+    wall_start = time.perf_counter()
+    cpu_start = cpu_clock()
+
+    if profiler is not None:
+        profiler.enable()
+
+    try:
+        yield record
+        record["status"] = record.get("status", "ok")
+    except BaseException:
+        record["status"] = "failed"
+        raise
+    finally:
+        if profiler is not None:
+            profiler.disable()
+
+        wall = time.perf_counter() - wall_start
+        cpu = cpu_clock() - cpu_start
+
+        stack.pop()
+
+        record["wall_seconds"] = round(wall, 6)
+        record["cpu_seconds"] = round(cpu, 6)
+        record["peak_rss_mb"] = _round(peak_rss_mb())
+
+        rows = record["rows_in"] if record["rows_in"] is not None else record["rows_out"]
+        record["items_per_sec"] = _round(rows / wall) if rows and wall > 0 else None
+
+        if profiler is not None:
+            os.makedirs(_run["profile_dir"], exist_ok=True)
+            path = os.path.join(_run["profile_dir"], f"{name}.prof")
+            profiler.dump_stats(path)
+            record["profile"] = path
+
+        if stack:
+            stack[-1].setdefault("functions", []).append(record)
+        elif _run["start_time"] is not None:
+            # Calls outside a run (e.g. from the dashboard) are not kept.
+            with _lock:
+                _run["records"].append(record)
+
+
+def instrument(name: str = None):
+    """
+    Decorator recording a hot function inside the current stage.
+
+    Rows in/out are taken from the first argument and the
+    return value when they are DataFrames, arrays or lists.
+    """
+
+    def decorator(func):
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            rows_in = count_rows(args[0]) if args else None
+
+            with stage(label, rows_in=rows_in, kind="function") as record:
+                result = func(*args, **kwargs)
+                record["rows_out"] = count_rows(result)
+
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def record_skipped(name: str, status: str) -> None:
+    """
+    Record a stage that did not execute (reused from cache or skipped).
+    """
+
+    with _lock:
+        _run["records"].append({
+            "name": name,
+            "kind": "stage",
+            "status": status,
+        })
+
+
+def add_section(key: str, value) -> None:
+    """
+    Attach extra machine-readable data (e.g. streaming stats).
+    """
+
+    with _lock:
+        _run["sections"][key] = value
+
+
+# =====================================================
+# REPORT
+# =====================================================
+
+def _round(value, digits: int = 3):
+    return None if value is None else round(value, digits)
+
+
+def _config_snapshot() -> dict:
+    import src.config as config
+
+    return {
+        key: getattr(config, key)
+        for key in dir(config)
+        if key.isupper()
+    }
+
+
+def build_report(argv: list = None) -> dict:
+    records = list(_run["records"])
+    executed = [r for r in records if "wall_seconds" in r]
+
+    total_wall = (
+        time.perf_counter() - _run["start_time"]
+        if _run["start_time"] is not None else None
+    )
+
+    peaks = [r["peak_rss_mb"] for r in executed if r.get("peak_rss_mb") is not None]
+
+    report = {
+        "started_at": _run["started_at"],
+        "finished_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "argv": argv if argv is not None else sys.argv[1:],
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "config": _config_snapshot(),
+        "stages": records,
+        "totals": {
+            "wall_seconds": _round(total_wall, 6),
+            "stage_wall_seconds": _round(sum(r["wall_seconds"] for r in executed), 6),
+            "stage_cpu_seconds": _round(sum(r["cpu_seconds"] for r in executed), 6),
+            "peak_rss_mb": max(peaks) if peaks else None,
+            "stages_ran": len(executed),
+            "stages_not_run": len(records) - len(executed),
+        },
+    }
+
+    report.update(_run["sections"])
+
+    if _run["profile_dir"]:
+        report["profile_dir"] = _run["profile_dir"]
+
+    return report
+
+
+def write_report(path: str = REPORT_PATH, argv: list = None) -> dict:
+    """
+    Write the JSON run report (stable key order for diffing).
+    """
+
+    report = build_report(argv)
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, sort_keys=True, default=str)
+
+    print(f"Saved run report to {path}")
+
+    return report
+
+
+def diff_reports(old: dict, new: dict) -> list:
+    """
+    Per-stage wall time / peak RSS deltas between two reports.
+    """
+
+    def index(report):
+        return {
+            r["name"]: r
+            for r in report.get("stages", [])
+            if "wall_seconds" in r
+        }
+
+    old_stages, new_stages = index(old), index(new)
+    rows = []
+
+    for name in list(dict.fromkeys([*old_stages, *new_stages])):
+        a, b = old_stages.get(name, {}), new_stages.get(name, {})
+        wall_a, wall_b = a.get("wall_seconds"), b.get("wall_seconds")
+
+        change = None
+        if wall_a and wall_b is not None:
+            change = (wall_b - wall_a) / wall_a
+
+        rows.append({
+            "name": name,
+            "old_wall_seconds": wall_a,
+            "new_wall_seconds": wall_b,
+            "wall_change": change,
+            "old_peak_rss_mb": a.get("peak_rss_mb"),
+            "new_peak_rss_mb": b.get("peak_rss_mb"),
+        })
+
+    return rows
+
+
+def _print_diff(old_path: str, new_path: str) -> None:
+    with open(old_path, "r", encoding="utf-8") as f:
+        old = json.load(f)
+    with open(new_path, "r", encoding="utf-8") as f:
+        new = json.load(f)
+
+    print(f"{'Stage':<16}{'Old s':>10}{'New s':>10}{'Change':>10}{'Old MB':>10}{'New MB':>10}")
+
+    def fmt(value, spec):
+        return format(value, spec) if value is not None else "-"
+
+    for row in diff_reports(old, new):
+        print(
+            f"{row['name']:<16}"
+            f"{fmt(row['old_wall_seconds'], '.2f'):>10}"
+            f"{fmt(row['new_wall_seconds'], '.2f'):>10}"
+            f"{fmt(row['wall_change'], '+.0%'):>10}"
+            f"{fmt(row['old_peak_rss_mb'], '.0f'):>10}"
+            f"{fmt(row['new_peak_rss_mb'], '.0f'):>10}"
+        )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 4 or sys.argv[1] != "diff":
+        raise SystemExit("Usage: python -m src.profiling diff OLD.json NEW.json")
+
+    _print_diff(sys.argv[2], sys.argv[3])
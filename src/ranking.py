@@ -6,7 +6,10 @@ and ranks products within each cluster.
 """
 
 import os
+from statistics import NormalDist
+import numpy as np
 import pandas as pd
+from src.config import RECENCY_HALF_LIFE_DAYS
 
 PROCESSED_DIR = "data/processed"
 
@@ -47,6 +50,31 @@ def apply_sentiment_penalty(product_df: pd.DataFrame) -> pd.DataFrame:
     return product_df
 
 
+def compute_recency_weighted_score(
+    product_df: pd.DataFrame,
+    metrics,
+    half_life_days: float = RECENCY_HALF_LIFE_DAYS
+) -> pd.DataFrame:
+    """
+    Recency-weighted score and within-cluster rank.
+
+    Same Bayesian rating × sentiment penalty as the all-time
+    score, computed from exponentially decayed review counts,
+    rating sums and negatives (``metrics`` is a
+    ``WindowedMetrics``), so old reviews fade out.
+    """
+
+    print(f"Computing recency-weighted scores (half-life {half_life_days} days)...")
+
+    stats = build_recency_stats(product_df, metrics, half_life_days)
+    scores = score_products(stats)
+
+    product_df["recency_score"] = scores
+    product_df["recency_rank"] = rank_scores(stats["cluster"], scores)
+
+    return product_df
+
+
 def rank_within_clusters(product_df: pd.DataFrame) -> pd.DataFrame:
     """
     Rank products inside each cluster.
@@ -65,4 +93,204 @@ def rank_within_clusters(product_df: pd.DataFrame) -> pd.DataFrame:
 
     print("Saved ranked_products.csv")
 
-    return product_df
\ No newline at end of file
+    return product_df
+
+# =====================================================
+# WHAT-IF RANKING ENGINE
+# =====================================================
+#
+# The functions above bake in a single prior and penalty.
+# The engine below keeps per-product sufficient statistics
+# as NumPy arrays so the whole catalogue can be re-scored
+# and re-ranked for any parameter choice in one vectorized
+# call (milliseconds, no pipeline rerun).
+
+SCORING_METHODS = ("bayesian", "wilson", "beta")
+
+
+def check_confidence(confidence: float) -> float:
+    """
+    Validate a confidence level (must lie strictly in (0, 1)).
+    """
+
+    confidence = float(confidence)
+    if not 0 < confidence < 1:
+        raise ValueError(
+            f"Confidence must be between 0 and 1 (exclusive), got {confidence}."
+        )
+    return confidence
+
+
+def build_ranking_stats(product_df: pd.DataFrame) -> dict:
+    """
+    Extract per-product sufficient statistics for re-ranking.
+
+    Returns:
+        dict: NumPy arrays keyed by statistic name
+        (counts, rating sums, negative counts, cluster ids)
+        plus the ASIN order they refer to.
+    """
+
+    counts = product_df["review_count"].to_numpy(dtype=np.float64)
+    ratings = product_df["avg_rating"].to_numpy(dtype=np.float64)
+
+    if "negative_count" in product_df.columns:
+        negatives = product_df["negative_count"].to_numpy(dtype=np.float64)
+    else:
+        negatives = (
+            product_df["negative_ratio"].to_numpy(dtype=np.float64) * counts
+        )
+
+    return {
+        "asin": product_df["asin"].to_numpy(),
+        "cluster": product_df["cluster"].to_numpy(dtype=np.int64),
+        "count": counts,
+        "rating_sum": ratings * counts,
+        "negative_count": negatives,
+    }
+
+
+def build_recency_stats(
+    product_df: pd.DataFrame,
+    metrics,
+    half_life_days: float = RECENCY_HALF_LIFE_DAYS,
+    as_of_ms: int = None
+) -> dict:
+    """
+    Sufficient statistics with exponentially decayed counts.
+
+    Drop-in replacement for ``build_ranking_stats`` that makes
+    ``score_products`` / ``rerank`` recency-weighted.
+    """
+
+    decayed = metrics.decayed_totals(half_life_days, as_of_ms)
+
+    rows = pd.Index(metrics.asins).get_indexer(product_df["asin"])
+    found = rows >= 0
+
+    def take(values):
+        out = np.zeros(len(rows))
+        out[found] = values[rows[found]]
+        return out
+
+    return {
+        "asin": product_df["asin"].to_numpy(),
+        "cluster": product_df["cluster"].to_numpy(dtype=np.int64),
+        "count": take(decayed["count"]),
+        "rating_sum": take(decayed["rating_sum"]),
+        "negative_count": take(decayed["negative_count"]),
+    }
+
+
+def default_ranking_params(stats: dict) -> dict:
+    """
+    Parameters that reproduce the batch pipeline scores.
+    """
+
+    counts = stats["count"]
+    safe_counts = np.maximum(counts, 1)
+
+    return {
+        "method": "bayesian",
+        "prior_strength": float(np.median(counts)),
+        "prior_mean": float(np.mean(stats["rating_sum"] / safe_counts)),
+        "penalty_weight": 1.0,
+        "confidence": 0.95,
+    }
+
+
+def score_products(stats: dict, **params) -> np.ndarray:
+    """
+    Vectorized product scores for the given parameters.
+
+    Methods:
+        bayesian: weighted rating shrunk toward ``prior_mean``
+                  with ``prior_strength`` pseudo-reviews, times
+                  ``1 - penalty_weight * negative_ratio``.
+        wilson:   lower bound of the two-sided ``confidence``
+                  Wilson interval of the positive-review share.
+        beta:     ``1 - confidence`` quantile of the Beta
+                  posterior of the positive share (one-sided
+                  lower credible bound).
+    """
+
+    settings = default_ranking_params(stats)
+    settings.update({k: v for k, v in params.items() if v is not None})
+
+    method = settings["method"]
+    if method not in SCORING_METHODS:
+        raise ValueError(
+            f"Unknown scoring method '{method}'. "
+            f"Expected one of {SCORING_METHODS}."
+        )
+
+    n = stats["count"]
+    safe_n = np.maximum(n, 1)
+    negatives = stats["negative_count"]
+    positives = n - negatives
+    confidence = check_confidence(settings["confidence"])
+
+    if method == "bayesian":
+        m = settings["prior_strength"]
+        C = settings["prior_mean"]
+        R = stats["rating_sum"] / safe_n
+
+        bayesian = (n * R + m * C) / np.maximum(n + m, 1e-12)
+        penalty = 1 - settings["penalty_weight"] * (negatives / safe_n)
+
+        return bayesian * np.clip(penalty, 0, None)
+
+    if method == "wilson":
+        z = NormalDist().inv_cdf(1 - (1 - confidence) / 2)
+        p = positives / safe_n
+        denom = 1 + z ** 2 / safe_n
+        centre = p + z ** 2 / (2 * safe_n)
+        margin = z * np.sqrt(p * (1 - p) / safe_n + z ** 2 / (4 * safe_n ** 2))
+
+        return np.where(n > 0, (centre - margin) / denom, 0.0)
+
+    # Beta(positives + 1, negatives + 1) posterior
+    from scipy.stats import beta
+
+    return beta.ppf(1 - confidence, positives + 1, negatives + 1)
+
+
+def rank_scores(cluster: np.ndarray, scores: np.ndarray) -> np.ndarray:
+    """
+    Rank scores within each cluster (1 = best).
+
+    Ties keep the original product order, matching
+    ``rank(method="first")`` in ``rank_within_clusters``.
+    """
+
+    position = np.arange(len(scores))
+    order = np.lexsort((position, -scores, cluster))
+
+    sorted_clusters = cluster[order]
+    starts = np.r_[0, np.flatnonzero(np.diff(sorted_clusters)) + 1]
+    group_sizes = np.diff(np.r_[starts, len(order)])
+    group_start = np.repeat(starts, group_sizes)
+
+    ranks = np.empty(len(scores), dtype=np.int64)
+    ranks[order] = position - group_start + 1
+
+    return ranks
+
+
+def rerank(product_df: pd.DataFrame, stats: dict, **params) -> pd.DataFrame:
+    """
+    Re-score and re-rank every cluster for user-chosen parameters.
+
+    ``stats`` must come from ``build_ranking_stats(product_df)``.
+    Returns a copy of ``product_df`` with ``final_score`` and
+    ``cluster_rank`` replaced; nothing is written to disk.
+    """
+
+    scores = score_products(stats, **params)
+    ranks = rank_scores(stats["cluster"], scores)
+
+    reranked = product_df.copy()
+    reranked["final_score"] = scores
+    reranked["cluster_rank"] = ranks
+
+    return reranked
@@ -0,0 +1,287 @@
+"""
+PDF report rendering module.
+
+Renders one formatted PDF per cluster (ranking table plus
+the generated report sections) with reportlab. The pipeline
+pre-renders every cluster in a process pool so the dashboard
+can serve downloads instantly; ``render_report_pdf`` is also
+used on demand for freshly generated reports.
+
+PDFs are rendered in reportlab's invariant mode (no creation
+timestamp or random document id), so identical inputs give
+byte-identical files and the stage cache can reuse them.
+"""
+
+import io
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.units import cm
+from reportlab.platypus import (
+    ListFlowable,
+    ListItem,
+    Paragraph,
+    SimpleDocTemplate,
+    Spacer,
+    Table,
+    TableStyle
+)
+
+from src.config import CATEGORY_MAP, N_CLUSTERS
+from src.profiling import instrument
+
+PROCESSED_DIR = "data/processed"
+
+TABLE_ROWS = 10
+
+# Ranking table: (column, header, format)
+TABLE_COLUMNS = [
+    ("cluster_rank", "Rank", "{:.0f}"),
+    ("asin", "ASIN", "{}"),
+    ("final_score", "Score", "{:.3f}"),
+    ("review_count", "Reviews", "{:.0f}"),
+    ("avg_rating", "Avg Rating", "{:.2f}"),
+    ("negative_ratio", "Negative Ratio", "{:.2f}"),
+    ("p_rank1", "P(#1)", "{:.0%}"),
+]
+
+_HEADER = re.compile(r"^=+\s*$\n^CATEGORY (\d+) REPORT\s*$\n^=+\s*$", re.MULTILINE)
+
+
+def pdf_name(cluster_id) -> str:
+    return f"report_cluster_{int(cluster_id)}.pdf"
+
+
+def split_reports(reports_text: str) -> dict:
+    """
+    Split ``generated_reports.txt`` into ``{cluster_id: report}``.
+    """
+
+    parts = _HEADER.split(reports_text)
+
+    # parts = [preamble, id, body, id, body, ...]
+    return {
+        int(cluster_id): body.strip()
+        for cluster_id, body in zip(parts[1::2], parts[2::2])
+    }
+
+
+# =====================================================
+# RENDERING
+# =====================================================
+
+def _escape(text: str) -> str:
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def _inline(text: str) -> str:
+    """
+    Escape text for reportlab paragraphs and keep
+    markdown **bold** / *italic*.
+    """
+
+    text = _escape(text)
+    text = re.sub(r"\*\*(.+?)\*\*", r"<b>\1</b>", text)
+    text = re.sub(r"(?<!\*)\*(?!\s)(.+?)(?<!\s)\*(?!\*)", r"<i>\1</i>", text)
+    return text
+
+
+def _paragraph(text: str, style) -> Paragraph:
+    """
+    Paragraph with inline markup, or plain escaped text when
+    the markdown is badly nested (``**a *b** c*`` gives
+    overlapping tags, which reportlab refuses to parse).
+    """
+
+    try:
+        return Paragraph(_inline(text), style)
+    except ValueError:
+        return Paragraph(_escape(text), style)
+
+
+def _report_flowables(report_text: str, styles) -> list:
+    """
+    Markdown-ish report text to headings, paragraphs and bullets.
+    """
+
+    flowables = []
+    bullets = []
+
+    def flush_bullets():
+        if bullets:
+            flowables.append(ListFlowable(
+                [ListItem(_paragraph(item, styles["BodyText"])) for item in bullets],
+                bulletType="bullet",
+                leftIndent=12
+            ))
+            bullets.clear()
+
+    for line in report_text.splitlines():
+        stripped = line.strip()
+
+        if not stripped:
+            flush_bullets()
+            continue
+
+        bullet = re.match(r"^(?:[-*•]|\d+\.)\s+(.*)", stripped)
+        if bullet:
+            bullets.append(bullet.group(1))
+            continue
+
+        flush_bullets()
+
+        heading = re.match(r"^#{1,6}\s*(.*)", stripped)
+        if heading or stripped.upper().startswith("SECTION"):
+            title = heading.group(1) if heading else stripped
+            flowables.append(_paragraph(title.strip("*"), styles["Heading2"]))
+        else:
+            flowables.append(_paragraph(stripped, styles["BodyText"]))
+
+    flush_bullets()
+
+    return flowables
+
+
+def _ranking_table(rows: list) -> Table:
+    columns = [col for col in TABLE_COLUMNS if rows and col[0] in rows[0]]
+
+    data = [[header for _, header, _ in columns]]
+    for row in rows:
+        data.append([
+            fmt.format(row[col]) if pd.notna(row[col]) else ""
+            for col, _, fmt in columns
+        ])
+
+    table = Table(data, repeatRows=1, hAlign="LEFT")
+    table.setStyle(TableStyle([
+        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#1f3b57")),
+        ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+        ("FONTSIZE", (0, 0), (-1, -1), 9),
+        ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.HexColor("#eef2f6")]),
+        ("GRID", (0, 0), (-1, -1), 0.25, colors.HexColor("#9aa8b5")),
+        ("ALIGN", (2, 1), (-1, -1), "RIGHT"),
+    ]))
+
+    return table
+
+
+def render_report_pdf(cluster_id, ranking_rows: list, report_text: str) -> bytes:
+    """
+    Render one cluster's report as PDF bytes.
+
+    Args:
+        cluster_id: Cluster number.
+        ranking_rows: Top products as records (``TABLE_COLUMNS``
+            keys), in rank order.
+        report_text: Generated report (markdown-ish text).
+    """
+
+    styles = getSampleStyleSheet()
+    category = CATEGORY_MAP.get(int(cluster_id), f"Category {cluster_id}")
+
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(
+        buffer,
+        pagesize=A4,
+        leftMargin=2 * cm,
+        rightMargin=2 * cm,
+        topMargin=2 * cm,
+        bottomMargin=2 * cm,
+        title=f"{category} Report",
+        author="AI-Powered Review Intelligence",
+        invariant=1
+    )
+
+    story = [
+        _paragraph(f"{category} — Executive Report", styles["Title"]),
+        Paragraph("Top Ranked Products", styles["Heading2"]),
+    ]
+
+    if ranking_rows:
+        story.append(_ranking_table(ranking_rows))
+    else:
+        story.append(Paragraph("No ranked products in this category.", styles["BodyText"]))
+
+    story.append(Spacer(1, 0.6 * cm))
+    story += _report_flowables(report_text or "No report generated.", styles)
+
+    doc.build(story)
+
+    return buffer.getvalue()
+
+
+def ranking_rows(cluster_df: pd.DataFrame, n: int = TABLE_ROWS) -> list:
+    """
+    Top ``n`` products of a cluster as plain records (picklable).
+    """
+
+    columns = [col for col, _, _ in TABLE_COLUMNS if col in cluster_df.columns]
+
+    return (
+        cluster_df.sort_values("cluster_rank")
+        .head(n)[columns]
+        .to_dict(orient="records")
+    )
+
+
+def _render_to_file(job: tuple) -> str:
+    cluster_id, rows, report_text, path = job
+
+    with open(path, "wb") as f:
+        f.write(render_report_pdf(cluster_id, rows, report_text))
+
+    return path
+
+
+# =====================================================
+# BATCH PRE-RENDERING
+# =====================================================
+
+@instrument()
+def render_report_pdfs(
+    ranked_df: pd.DataFrame,
+    reports_text: str,
+    max_workers: int = None
+) -> list:
+    """
+    Pre-render every cluster's PDF in a process pool.
+
+    Writes ``report_cluster_<id>.pdf`` to PROCESSED_DIR for
+    each of the ``N_CLUSTERS`` clusters.
+
+    Returns:
+        list[str]: Written paths.
+    """
+
+    print("Rendering PDF reports...")
+
+    reports = split_reports(reports_text)
+    os.makedirs(PROCESSED_DIR, exist_ok=True)
+
+    jobs = [
+        (
+            cluster_id,
+            ranking_rows(ranked_df[ranked_df["cluster"] == cluster_id]),
+            reports.get(cluster_id, ""),
+            os.path.join(PROCESSED_DIR, pdf_name(cluster_id)),
+        )
+        for cluster_id in range(N_CLUSTERS)
+    ]
+
+    workers = min(len(jobs), max_workers or os.cpu_count() or 1)
+
+    if workers <= 1:
+        paths = [_render_to_file(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            paths = list(pool.map(_render_to_file, jobs))
+
+    print(f"Saved {len(paths)} PDF reports ({workers} worker process(es))")
+
+    return paths
@@ -0,0 +1,324 @@
+"""
+Review search module.
+
+Builds an SQLite FTS5 full-text index over individual
+reviews (asin, cluster, rating, sentiment, title, text) and
+answers dashboard queries with BM25 ranking and snippets.
+
+- ``reviews`` holds one row per review; FTS5 indexes it as
+  external content, so review text is stored once.
+- asin, cluster and sentiment are indexed FTS columns with
+  zero BM25 weight: product / category / sentiment filters
+  are part of the MATCH expression and intersect posting
+  lists instead of scanning every text match.
+- Every match is BM25-scored; ``ORDER BY rank LIMIT`` keeps
+  only the top page in a bounded sorter. ``count_matches``
+  gives the total number of matches.
+- Product drill-down reads ``reviews`` through an
+  (asin, timestamp) index.
+"""
+
+import os
+import re
+import sqlite3
+
+import pandas as pd
+
+from src.profiling import instrument
+
+PROCESSED_DIR = "data/processed"
+INDEX_NAME = "review_index.db"
+INDEX_PATH = f"{PROCESSED_DIR}/{INDEX_NAME}"
+
+# BM25 column weights: text, title, asin, cluster, sentiment
+BM25_WEIGHTS = (1.0, 0.5, 0.0, 0.0, 0.0)
+
+INSERT_BATCH_SIZE = 50_000
+
+
+# =====================================================
+# INDEX BUILD
+# =====================================================
+
+def _review_rows(review_df: pd.DataFrame, clusters: dict):
+    # Newest first (rowid order is the drill-down's natural order)
+    columns = review_df[
+        ["asin", "rating", "sentiment_label", "title", "timestamp", "text"]
+    ].sort_values("timestamp", ascending=False, kind="stable")
+
+    for asin, rating, sentiment, title, timestamp, text in columns.itertuples(
+        index=False, name=None
+    ):
+        yield (
+            asin,
+            clusters.get(asin),
+            float(rating),
+            sentiment,
+            title,
+            int(timestamp),
+            text,
+        )
+
+
+@instrument()
+def build_review_index(
+    review_df: pd.DataFrame,
+    cluster_df: pd.DataFrame,
+    path: str = INDEX_PATH
+) -> int:
+    """
+    Build the FTS5 review index.
+
+    Reviews of products dropped before clustering are indexed
+    with no cluster. The index is written to a temporary file
+    and moved into place, so a running dashboard never sees a
+    half-built index.
+
+    Returns:
+        int: Number of indexed reviews.
+    """
+
+    print("Building review search index...")
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    clusters = dict(zip(cluster_df["asin"], cluster_df["cluster"].astype(int)))
+
+    conn = sqlite3.connect(tmp_path)
+
+    try:
+        # Bulk load: no journal, no fsync; the file is only
+        # published after a successful build.
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+
+        conn.executescript("""
+            CREATE TABLE reviews (
+                id INTEGER PRIMARY KEY,
+                asin TEXT NOT NULL,
+                cluster INTEGER,
+                rating REAL,
+                sentiment TEXT,
+                title TEXT,
+                timestamp INTEGER,
+                text TEXT
+            );
+
+            CREATE VIRTUAL TABLE review_fts USING fts5(
+                text,
+                title,
+                asin,
+                cluster,
+                sentiment,
+                content = 'reviews',
+                content_rowid = 'id',
+                tokenize = 'porter unicode61'
+            );
+        """)
+
+        rows = _review_rows(review_df, clusters)
+        insert = (
+            "INSERT INTO reviews "
+            "(asin, cluster, rating, sentiment, title, timestamp, text) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)"
+        )
+
+        while True:
+            batch = [row for _, row in zip(range(INSERT_BATCH_SIZE), rows)]
+            if not batch:
+                break
+            conn.executemany(insert, batch)
+
+        conn.executescript(f"""
+            INSERT INTO review_fts (rowid, text, title, asin, cluster, sentiment)
+            SELECT id, text, title, asin, cluster, sentiment FROM reviews;
+
+            INSERT INTO review_fts (review_fts, rank)
+            VALUES ('rank', 'bm25({", ".join(str(w) for w in BM25_WEIGHTS)})');
+
+            INSERT INTO review_fts (review_fts) VALUES ('optimize');
+
+            CREATE INDEX reviews_asin ON reviews (asin, timestamp);
+        """)
+
+        conn.commit()
+        count = conn.execute("SELECT COUNT(*) FROM reviews").fetchone()[0]
+
+    finally:
+        conn.close()
+
+    os.replace(tmp_path, path)
+
+    print(f"Indexed {count} reviews in {INDEX_NAME}")
+
+    return count
+
+
+# =====================================================
+# QUERIES
+# =====================================================
+
+def open_index(path: str = INDEX_PATH) -> sqlite3.Connection:
+    """
+    Open the index read-only (safe to share across
+    Streamlit reruns and threads).
+    """
+
+    if not os.path.exists(path):
+        raise FileNotFoundError(
+            f"Review index not found at {path}. "
+            "Run the 'index' pipeline stage first."
+        )
+
+    return sqlite3.connect(
+        f"file:{path}?mode=ro",
+        uri=True,
+        check_same_thread=False
+    )
+
+
+def _quote(term: str) -> str:
+    return '"' + term.replace('"', '""') + '"'
+
+
+def build_match_expression(
+    query: str,
+    asin: str = None,
+    cluster: int = None,
+    sentiment: str = None
+) -> str:
+    """
+    Turn free text into an FTS5 MATCH expression.
+
+    Words are quoted (so user input cannot break the query
+    syntax) and combined with AND; a trailing ``*`` keeps
+    prefix search (``batt*``). Double-quoted input is kept
+    as a phrase. Filters become column-scoped terms.
+
+    Returns an empty expression when the query has no words
+    (``!!!``): filters alone would match every review in scope.
+    """
+
+    terms = []
+
+    for phrase, word in re.findall(r'"([^"]+)"|(\w+\*?)', query or ""):
+        if phrase:
+            if re.search(r"\w", phrase):
+                terms.append(_quote(phrase))
+        elif word.endswith("*"):
+            terms.append(_quote(word[:-1]) + "*")
+        else:
+            terms.append(_quote(word))
+
+    if not terms:
+        return ""
+
+    text = "{text title} : (" + " AND ".join(terms) + ")"
+
+    filters = []
+    if asin is not None:
+        filters.append(f"asin : {_quote(asin)}")
+    if cluster is not None:
+        filters.append(f"cluster : {_quote(str(int(cluster)))}")
+    if sentiment is not None:
+        filters.append(f"sentiment : {_quote(sentiment)}")
+
+    return " AND ".join([text, *filters])
+
+
+def search_reviews(
+    conn: sqlite3.Connection,
+    query: str,
+    asin: str = None,
+    cluster: int = None,
+    sentiment: str = None,
+    limit: int = 20
+) -> pd.DataFrame:
+    """
+    BM25-ranked review search with highlighted snippets.
+
+    All matches are ranked (``rank`` is configured as
+    ``bm25`` with ``BM25_WEIGHTS``); the best ``limit`` are
+    returned.
+
+    Returns:
+        pd.DataFrame: asin, cluster, rating, sentiment, title,
+        snippet and bm25 score (lower is more relevant).
+    """
+
+    columns = ["asin", "cluster", "rating", "sentiment", "title", "snippet", "score"]
+
+    expression = build_match_expression(query, asin, cluster, sentiment)
+    if not expression:
+        return pd.DataFrame(columns=columns)
+
+    rows = conn.execute(
+        """
+        SELECT r.asin, r.cluster, r.rating, r.sentiment, r.title,
+               snippet(review_fts, 0, '**', '**', ' … ', 24),
+               review_fts.rank
+        FROM review_fts
+        JOIN reviews AS r ON r.id = review_fts.rowid
+        WHERE review_fts MATCH ?
+        ORDER BY review_fts.rank
+        LIMIT ?
+        """,
+        (expression, limit)
+    ).fetchall()
+
+    return pd.DataFrame(rows, columns=columns)
+
+
+def count_matches(
+    conn: sqlite3.Connection,
+    query: str,
+    asin: str = None,
+    cluster: int = None,
+    sentiment: str = None
+) -> int:
+    """
+    Total number of reviews matching a search (no scoring).
+    """
+
+    expression = build_match_expression(query, asin, cluster, sentiment)
+    if not expression:
+        return 0
+
+    return conn.execute(
+        "SELECT COUNT(*) FROM review_fts WHERE review_fts MATCH ?",
+        (expression,)
+    ).fetchone()[0]
+
+
+def product_reviews(
+    conn: sqlite3.Connection,
+    asin: str,
+    sentiment: str = None,
+    limit: int = 50
+) -> pd.DataFrame:
+    """
+    Most recent reviews of one product (drill-down).
+    """
+
+    sql = (
+        "SELECT rating, sentiment, title, timestamp, text "
+        "FROM reviews WHERE asin = ?"
+    )
+    params = [asin]
+
+    if sentiment is not None:
+        sql += " AND sentiment = ?"
+        params.append(sentiment)
+
+    sql += " ORDER BY timestamp DESC LIMIT ?"
+    params.append(limit)
+
+    rows = conn.execute(sql, params).fetchall()
+
+    return pd.DataFrame(
+        rows,
+        columns=["rating", "sentiment", "title", "timestamp", "text"]
+    )
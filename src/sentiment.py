@@ -4,17 +4,20 @@ Sentiment evaluation module using pretrained DistilBERT.
 
 import os
 import pandas as pd
-from transformers import pipeline
-from sklearn.metrics import classification_report, confusion_matrix
+from src.batch_tuning import run_batched, tuned_batch_size
 from src.config import SENTIMENT_MODEL
+from src.model_registry import get_model
+from src.profiling import instrument
 
 PROCESSED_DIR = "data/processed"
 
 
-def load_sentiment_model():
+def build_sentiment_model():
     """
-    Load pretrained sentiment model with truncation enabled.
+    Build pretrained sentiment model with truncation enabled.
     """
+    from transformers import pipeline
+
     return pipeline(
         "sentiment-analysis",
         model=SENTIMENT_MODEL,
@@ -23,21 +26,42 @@ def load_sentiment_model():
     )
 
 
+def warm_up_sentiment_model(classifier) -> None:
+    classifier(["Warm-up review: the speaker sounds great."])
+
+
+def load_sentiment_model():
+    """
+    Shared sentiment model, loaded once per process.
+    """
+    return get_model("sentiment")
+
+
+@instrument()
 def evaluate_sentiment_model(df: pd.DataFrame) -> None:
     """
     Evaluate model against star-based sentiment mapping.
     """
+    from sklearn.metrics import classification_report, confusion_matrix
 
     print("Loading sentiment model...")
 
     classifier = load_sentiment_model()
 
     sample_df = df.sample(min(2000, len(df)), random_state=42)
+    texts = sample_df["text"].tolist()
 
-    predictions = classifier(
-        sample_df["text"].tolist(),
-        batch_size=16
-    )
+    def infer(batch, batch_size):
+        return classifier(batch, batch_size=batch_size)
+
+    device = str(getattr(classifier, "device", "cpu"))
+    batch_size = tuned_batch_size("sentiment", SENTIMENT_MODEL, infer, texts, device)
+
+    predictions = [
+        p
+        for chunk in run_batched("sentiment", infer, texts, batch_size, device)
+        for p in chunk
+    ]
 
     sample_df["predicted_label"] = [
         "positive" if p["label"] == "POSITIVE" else "negative"
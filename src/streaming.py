@@ -0,0 +1,392 @@
+"""
+Streaming execution module.
+
+Runs the front half of the pipeline as concurrent stages
+connected by bounded queues:
+
+    ingest/filter → sentiment scoring → incremental
+    aggregation → embedding
+
+Each stage runs in its own thread; full queues block the
+producer (backpressure). Outputs match the batch pipeline,
+so clustering onward runs unchanged on the written artifacts.
+"""
+
+import os
+import queue
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.preprocessing import (
+    iter_review_batches,
+    filter_audio_reviews,
+    label_sentiment
+)
+from src.batch_tuning import run_batched, tuned_batch_size
+from src.config import EMBEDDING_MODEL
+from src.sentiment import evaluate_sentiment_model
+from src.aggregation import IncrementalAggregator, save_products
+from src.embeddings import (
+    filter_products,
+    load_embedding_model,
+    save_embeddings
+)
+
+PROCESSED_DIR = "data/processed"
+
+INGEST_BATCH_SIZE = 2000
+EMBED_BATCH_SIZE = 256
+QUEUE_SIZE = 4
+
+_END = object()
+
+
+class StreamStage:
+    """
+    One thread of the streaming executor.
+
+    ``process(item)`` returns a list of items for the next
+    queue; ``finish()`` is called once the input is exhausted
+    and may flush remaining items downstream.
+    """
+
+    def __init__(self, name, process, finish=None):
+        self.name = name
+        self.process = process
+        self.finish = finish or (lambda: [])
+        self.busy = 0.0
+        self.starved = 0.0
+        self.blocked = 0.0
+        self.items_in = 0
+        self.items_out = 0
+
+
+class _Aborted(Exception):
+    pass
+
+
+def _get(q, stop):
+    while True:
+        if stop.is_set():
+            raise _Aborted()
+        try:
+            return q.get(timeout=0.1)
+        except queue.Empty:
+            continue
+
+
+def _put(q, item, stop):
+    while True:
+        if stop.is_set():
+            raise _Aborted()
+        try:
+            q.put(item, timeout=0.1)
+            return
+        except queue.Full:
+            continue
+
+
+def _run_stage(stage, in_queue, out_queue, stop, errors):
+    """
+    Pull from ``in_queue``, process, push to ``out_queue``.
+    """
+
+    def emit(items):
+        for item in items:
+            start = time.perf_counter()
+            _put(out_queue, item, stop)
+            stage.blocked += time.perf_counter() - start
+            stage.items_out += 1
+
+    try:
+        while True:
+            start = time.perf_counter()
+            item = _get(in_queue, stop)
+            stage.starved += time.perf_counter() - start
+
+            if item is _END:
+                break
+
+            stage.items_in += 1
+            start = time.perf_counter()
+            outputs = stage.process(item)
+            stage.busy += time.perf_counter() - start
+            emit(outputs)
+
+        start = time.perf_counter()
+        outputs = stage.finish()
+        stage.busy += time.perf_counter() - start
+        emit(outputs)
+
+        _put(out_queue, _END, stop)
+
+    except _Aborted:
+        pass
+    except Exception as e:
+        errors.append((stage.name, e))
+        stop.set()
+
+
+def _run_source(stage, batches, out_queue, stop, errors):
+    """
+    Feed a batch iterator into the first queue.
+    """
+
+    try:
+        iterator = iter(batches)
+        while True:
+            start = time.perf_counter()
+            try:
+                raw = next(iterator)
+            except StopIteration:
+                break
+            outputs = stage.process(raw)
+            stage.busy += time.perf_counter() - start
+            stage.items_in += 1
+
+            for item in outputs:
+                start = time.perf_counter()
+                _put(out_queue, item, stop)
+                stage.blocked += time.perf_counter() - start
+                stage.items_out += 1
+
+        _put(out_queue, _END, stop)
+
+    except _Aborted:
+        pass
+    except Exception as e:
+        errors.append((stage.name, e))
+        stop.set()
+
+
+def run_streaming(
+    batches=None,
+    queue_size: int = QUEUE_SIZE,
+    embed_batch_size: int = EMBED_BATCH_SIZE
+) -> dict:
+    """
+    Run ingest → scoring → aggregation → embedding concurrently.
+
+    Writes the same artifacts as the batch ``preprocess``,
+    ``sentiment``, ``aggregate`` and ``embed`` stages.
+
+    Args:
+        batches: Iterable of raw review DataFrames. Defaults to
+            streaming the configured dataset sample.
+
+    Returns:
+        dict: Wall-clock time and per-stage utilization stats.
+    """
+
+    if batches is None:
+        batches = iter_review_batches(INGEST_BATCH_SIZE)
+
+    print("Starting streaming executor...")
+
+    reviews = []
+    aggregator = IncrementalAggregator()
+    embeddings = []
+    model_holder = {}
+    evaluation = {}
+
+    # -----------------------------
+    # Stage callables
+    # -----------------------------
+    def ingest(raw):
+        batch = filter_audio_reviews(raw)
+        return [batch] if len(batch) else []
+
+    def score(batch):
+        batch = label_sentiment(batch.copy())
+        reviews.append(batch)
+        return [batch]
+
+    def run_evaluation(df):
+        start = time.perf_counter()
+        try:
+            evaluate_sentiment_model(df)
+        except Exception as e:
+            errors.append(("sentiment-eval", e))
+        evaluation["seconds"] = time.perf_counter() - start
+
+    def finish_score():
+        # The classifier evaluation samples the full corpus, so it
+        # starts once ingest is done and overlaps with aggregation
+        # and embedding.
+        df = pd.concat(reviews, ignore_index=True)
+        df.to_csv(f"{PROCESSED_DIR}/clean_reviews.csv", index=False)
+        print(f"Filtered audio-related reviews: {len(df)}")
+        print("Saved clean_reviews.csv")
+
+        thread = threading.Thread(
+            target=run_evaluation,
+            args=(df,),
+            name="sentiment-eval"
+        )
+        thread.start()
+        evaluation["thread"] = thread
+        return []
+
+    def aggregate(batch):
+        aggregator.update(batch)
+        return []
+
+    def finish_aggregate():
+        product_df = aggregator.result()
+        print(f"Number of unique products: {len(product_df)}")
+        save_products(product_df)
+
+        filtered = filter_products(product_df)
+        texts = filtered["combined_text"].tolist()
+
+        return [
+            texts[i:i + embed_batch_size]
+            for i in range(0, len(texts), embed_batch_size)
+        ]
+
+    def load_model():
+        # Loaded up front so model start-up overlaps with ingest.
+        try:
+            model_holder["model"] = load_embedding_model()
+        except Exception as e:
+            errors.append(("embed", e))
+            stop.set()
+
+    def embed(texts):
+        model_loader.join()
+        if "model" not in model_holder:
+            raise _Aborted()
+        model = model_holder["model"]
+
+        def infer(batch, batch_size):
+            return model.encode(batch, batch_size=batch_size)
+
+        device = str(getattr(model, "device", "cpu"))
+        if "tuned" not in model_holder:
+            # Calibrated on the first chunk (once per host)
+            tuned_batch_size("embedding", EMBEDDING_MODEL, infer, texts, device)
+            model_holder["tuned"] = True
+
+        embeddings.extend(run_batched("embedding", infer, texts, device=device))
+        return []
+
+    def finish_embed():
+        save_embeddings(np.concatenate(embeddings))
+        return []
+
+    stages = [
+        StreamStage("ingest", ingest),
+        StreamStage("score", score, finish_score),
+        StreamStage("aggregate", aggregate, finish_aggregate),
+        StreamStage("embed", embed, finish_embed),
+    ]
+
+    # -----------------------------
+    # Wire threads and queues
+    # -----------------------------
+    os.makedirs(PROCESSED_DIR, exist_ok=True)
+
+    queues = [queue.Queue(maxsize=queue_size) for _ in stages]
+    stop = threading.Event()
+    errors = []
+
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+
+    model_loader = threading.Thread(target=load_model, name="embed-model-load")
+    model_loader.start()
+
+    threads = [
+        threading.Thread(
+            target=_run_source,
+            args=(stages[0], batches, queues[0], stop, errors),
+            name="stream-ingest"
+        )
+    ]
+    for i, stage in enumerate(stages[1:], start=1):
+        threads.append(
+            threading.Thread(
+                target=_run_stage,
+                args=(stage, queues[i - 1], queues[i], stop, errors),
+                name=f"stream-{stage.name}"
+            )
+        )
+
+    for thread in threads:
+        thread.start()
+
+    # Drain the terminal queue so the last stage never blocks.
+    while any(thread.is_alive() for thread in threads):
+        try:
+            queues[-1].get(timeout=0.1)
+        except queue.Empty:
+            pass
+
+    for thread in threads:
+        thread.join()
+
+    model_loader.join()
+
+    if "thread" in evaluation:
+        evaluation["thread"].join()
+
+    wall = time.perf_counter() - start
+    cpu = time.process_time() - cpu_start
+
+    if errors:
+        name, error = errors[0]
+        raise RuntimeError(f"Streaming stage '{name}' failed: {error}") from error
+
+    stats = {
+        "wall_seconds": wall,
+        "cpu_seconds": cpu,
+        "stages": [
+            {
+                "name": stage.name,
+                "busy_seconds": stage.busy,
+                "starved_seconds": stage.starved,
+                "blocked_seconds": stage.blocked,
+                "items_in": stage.items_in,
+                "items_out": stage.items_out,
+                "utilization": stage.busy / wall if wall else 0.0,
+            }
+            for stage in stages
+        ],
+    }
+
+    if "seconds" in evaluation:
+        stats["stages"].append({
+            "name": "sentiment-eval",
+            "busy_seconds": evaluation["seconds"],
+            "utilization": evaluation["seconds"] / wall if wall else 0.0,
+        })
+
+    return stats
+
+
+def print_streaming_summary(stats: dict) -> None:
+    """
+    Print wall-clock and per-stage utilization.
+    """
+
+    wall = stats["wall_seconds"]
+
+    print("\n=== STREAMING SUMMARY ===")
+    print(f"{'Stage':<16}{'Busy s':>10}{'Starved s':>12}{'Blocked s':>12}{'Util':>8}")
+
+    for stage in stats["stages"]:
+        print(
+            f"{stage['name']:<16}"
+            f"{stage['busy_seconds']:>10.2f}"
+            f"{stage.get('starved_seconds', 0.0):>12.2f}"
+            f"{stage.get('blocked_seconds', 0.0):>12.2f}"
+            f"{stage['utilization']:>8.0%}"
+        )
+
+    print(
+        f"\nWall-clock {wall:.2f}s, CPU {stats['cpu_seconds']:.2f}s "
+        f"(CPU/wall {stats['cpu_seconds'] / wall if wall else 0.0:.0%})"
+    )
@@ -0,0 +1,328 @@
+"""
+Score uncertainty module.
+
+Vectorized bootstrap of ``final_score`` for all products at
+once: per-review ratings and sentiment flags are reduced to
+per-product category counts (one ``bincount`` over product
+offsets), then every resample is drawn for every product
+with array operations — no Python loop per product.
+
+Resampling a product's reviews with replacement is a
+multinomial draw over its (rating, negative) categories.
+
+- Products with fewer than ``BOOTSTRAP_EXACT_MAX_REVIEWS``
+  reviews use exact resampling patterns: for each review
+  count ``n`` a pool of multinomial(n, uniform) draws is
+  generated once and scored for every distinct set of
+  category counts; each product/resample then picks a
+  random pattern, i.e. one table lookup.
+- Larger products use the bootstrap's normal limit, with the
+  exact bootstrap mean and covariance of (rating sum,
+  negative count).
+
+Outputs per product: score interval, standard error and
+the probability of ranking #1 / top-k within its cluster.
+"""
+
+import numpy as np
+import pandas as pd
+
+from src.config import (
+    BOOTSTRAP_RESAMPLES,
+    BOOTSTRAP_CONFIDENCE,
+    BOOTSTRAP_EXACT_MAX_REVIEWS,
+    BOOTSTRAP_POOL_SIZE,
+    BOOTSTRAP_TOP_K,
+    RANDOM_STATE
+)
+
+# Resamples scored per chunk (bounds working memory).
+CHUNK_SIZE = 50
+
+
+def review_category_counts(review_df: pd.DataFrame, asins) -> tuple:
+    """
+    Per-product counts over (rating, negative) categories.
+
+    Categories are ordered negatives first, so a product's
+    negative count is a single prefix sum.
+
+    Returns:
+        (counts (P, K), category_rating (K,), category_negative (K,))
+    """
+
+    rows = pd.Index(asins).get_indexer(review_df["asin"])
+    keep = rows >= 0
+
+    ratings = review_df["rating"].to_numpy(dtype=np.float64)[keep]
+    negative = (review_df["sentiment_label"] == "negative").to_numpy()[keep]
+    rows = rows[keep]
+
+    # Negatives sort first, then by rating.
+    keys = np.where(negative, 0.0, 10.0) + ratings
+    categories, category_ids = np.unique(keys, return_inverse=True)
+
+    n_products, n_categories = len(asins), len(categories)
+
+    counts = np.bincount(
+        rows * n_categories + category_ids,
+        minlength=n_products * n_categories
+    ).reshape(n_products, n_categories)
+
+    category_negative = categories < 10.0
+    category_rating = np.where(category_negative, categories, categories - 10.0)
+
+    return counts, category_rating, category_negative
+
+
+def _pattern_pool(sizes, pool_size: int, rng) -> tuple:
+    """
+    Prefix-summed multinomial(n, uniform) resampling patterns.
+
+    Row ``q`` of the pool for size ``n`` starts at
+    ``starts[n] + q * (n + 1)`` in the flat array; entry ``j``
+    is how many of the first ``j`` reviews were drawn.
+    """
+
+    starts = np.zeros(BOOTSTRAP_EXACT_MAX_REVIEWS + 1, dtype=np.int64)
+    blocks = []
+    offset = 0
+
+    for n in sorted(set(int(size) for size in sizes)):
+        # n = 0 gets an all-zero block (nothing to resample)
+        prefix = np.zeros((pool_size, n + 1), dtype=np.int16)
+        if n:
+            draws = rng.multinomial(n, np.full(n, 1.0 / n), size=pool_size)
+            np.cumsum(draws, axis=1, out=prefix[:, 1:])
+
+        starts[n] = offset
+        blocks.append(prefix.ravel())
+        offset += prefix.size
+
+    flat = np.concatenate(blocks) if blocks else np.zeros(0, dtype=np.int16)
+
+    return flat, starts
+
+
+def _composition_scores(
+    compositions: np.ndarray,
+    category_rating: np.ndarray,
+    n_negative_categories: int,
+    prior_strength: float,
+    prior_mean: float,
+    rng
+) -> np.ndarray:
+    """
+    Score of every (category counts, resampling pattern) pair.
+
+    Products sharing the same category counts share a row, so
+    the per-resample work is one table lookup per product.
+
+    Returns:
+        np.ndarray: (n_compositions, BOOTSTRAP_POOL_SIZE) float32
+    """
+
+    n = compositions.sum(axis=1)
+    flat, starts = _pattern_pool(n, BOOTSTRAP_POOL_SIZE, rng)
+
+    # Telescoped rating sum: with prefix totals P_k at each
+    # category end, S = r_K·n + sum_k (r_k - r_{k+1})·P_k.
+    # Negatives come first, so the negative count is the
+    # prefix total at the end of the negative categories.
+    step = category_rating[:-1] - category_rating[1:]
+    ends = np.cumsum(compositions, axis=1)
+    inner = ends[:, :-1]
+
+    patterns = np.arange(BOOTSTRAP_POOL_SIZE)
+    table = np.empty((len(compositions), BOOTSTRAP_POOL_SIZE), dtype=np.float32)
+
+    for lo in range(0, len(compositions), 1024):
+        hi = lo + 1024
+        block_n = n[lo:hi, None]
+        base = starts[n[lo:hi]][:, None] + patterns * (block_n + 1)
+
+        rating_sum = np.broadcast_to(
+            category_rating[-1] * block_n, base.shape
+        ).astype(np.float64)
+        for k in range(len(step)):
+            rating_sum += step[k] * flat[base + inner[lo:hi, k:k + 1]]
+
+        if n_negative_categories:
+            last = n_negative_categories - 1
+            negatives = flat[base + ends[lo:hi, last:last + 1]]
+        else:
+            negatives = np.zeros(base.shape)
+
+        table[lo:hi] = (
+            (rating_sum + prior_strength * prior_mean) / (block_n + prior_strength)
+            * (1 - negatives / np.maximum(block_n, 1))
+        )
+
+    return table
+
+
+def bootstrap_scores(
+    counts: np.ndarray,
+    category_rating: np.ndarray,
+    category_negative: np.ndarray,
+    prior_strength: float,
+    prior_mean: float,
+    n_resamples: int = BOOTSTRAP_RESAMPLES,
+    seed: int = RANDOM_STATE
+):
+    """
+    Yield chunks of bootstrap ``final_score`` draws, shape (b, P).
+
+    Scores use the pipeline formula with the prior held fixed:
+    ``(S + m·C) / (n + m) × (1 - negatives / n)``.
+    """
+
+    rng = np.random.default_rng(seed)
+
+    n = counts.sum(axis=1)
+
+    # Products without matching reviews (n = 0) take the
+    # exact path and score the prior at every resample.
+    small = np.flatnonzero(n < BOOTSTRAP_EXACT_MAX_REVIEWS)
+    large = np.flatnonzero(n >= BOOTSTRAP_EXACT_MAX_REVIEWS)
+
+    # -----------------------------
+    # Exact patterns (small products)
+    # -----------------------------
+    compositions, composition_ids = np.unique(
+        counts[small], axis=0, return_inverse=True
+    )
+    table = _composition_scores(
+        compositions,
+        category_rating,
+        int(category_negative.sum()),
+        prior_strength,
+        prior_mean,
+        rng
+    ).ravel()
+    index_type = np.int32 if table.size < 2 ** 31 else np.int64
+    rows = composition_ids.ravel().astype(index_type) * BOOTSTRAP_POOL_SIZE
+
+    # -----------------------------
+    # Normal limit (large products)
+    # -----------------------------
+    large_n = n[large].astype(np.float64)
+    p = counts[large] / large_n[:, None]
+    neg = category_negative.astype(np.float64)
+    mean_r = p @ category_rating
+    mean_g = p @ neg
+    var_r = p @ category_rating ** 2 - mean_r ** 2
+    var_g = mean_g - mean_g ** 2
+    cov_rg = p @ (category_rating * neg) - mean_r * mean_g
+
+    # 2x2 Cholesky factor of the per-review covariance
+    chol_a = np.sqrt(np.maximum(var_r, 0))
+    chol_b = np.divide(cov_rg, chol_a, out=np.zeros_like(cov_rg), where=chol_a > 0)
+    chol_c = np.sqrt(np.maximum(var_g - chol_b ** 2, 0))
+    root_n = np.sqrt(large_n)
+
+    # Work on small-then-large columns, restore order per chunk.
+    restore = np.argsort(np.concatenate([small, large]))
+
+    for start in range(0, n_resamples, CHUNK_SIZE):
+        b = min(CHUNK_SIZE, n_resamples - start)
+
+        q = rng.integers(0, BOOTSTRAP_POOL_SIZE, size=(b, len(small)), dtype=index_type)
+        small_scores = table[rows + q]
+
+        z1 = rng.standard_normal((b, len(large)))
+        z2 = rng.standard_normal((b, len(large)))
+
+        rating_sum = np.clip(
+            large_n * mean_r + root_n * chol_a * z1,
+            large_n * category_rating.min(),
+            large_n * category_rating.max()
+        )
+        negatives = np.clip(
+            large_n * mean_g + root_n * (chol_b * z1 + chol_c * z2),
+            0,
+            large_n
+        )
+        large_scores = (
+            (rating_sum + prior_strength * prior_mean) / (large_n + prior_strength)
+            * (1 - negatives / large_n)
+        )
+
+        yield np.concatenate([small_scores, large_scores], axis=1)[:, restore]
+
+
+def score_intervals(
+    product_df: pd.DataFrame,
+    review_df: pd.DataFrame,
+    n_resamples: int = BOOTSTRAP_RESAMPLES,
+    confidence: float = BOOTSTRAP_CONFIDENCE,
+    top_k: int = BOOTSTRAP_TOP_K,
+    seed: int = RANDOM_STATE
+) -> pd.DataFrame:
+    """
+    Bootstrap score intervals and rank-stability probabilities.
+
+    Uses the same prior as ``compute_bayesian_score``
+    (m = median review count, C = mean product rating).
+
+    Returns:
+        pd.DataFrame: ``product_df`` with ``score_low``,
+        ``score_high``, ``score_se``, ``p_rank1`` and
+        ``p_top{k}`` columns added.
+    """
+
+    print(f"Bootstrapping score intervals ({n_resamples} resamples)...")
+
+    counts, category_rating, category_negative = review_category_counts(
+        review_df,
+        product_df["asin"]
+    )
+
+    prior_mean = product_df["avg_rating"].mean()
+    prior_strength = product_df["review_count"].median()
+
+    clusters = product_df["cluster"].to_numpy()
+    members = [np.flatnonzero(clusters == c) for c in np.unique(clusters)]
+
+    n_products = len(product_df)
+    draws = np.empty((n_resamples, n_products), dtype=np.float32)
+    rank1 = np.zeros(n_products)
+    topk = np.zeros(n_products)
+
+    filled = 0
+    for chunk in bootstrap_scores(
+        counts,
+        category_rating,
+        category_negative,
+        prior_strength,
+        prior_mean,
+        n_resamples,
+        seed
+    ):
+        b = len(chunk)
+        draws[filled:filled + b] = chunk
+        filled += b
+
+        # Rank stability: who is #1 / top-k in each cluster,
+        # without fully sorting every resample.
+        for cols in members:
+            sub = chunk[:, cols]
+            rank1 += np.bincount(cols[sub.argmax(axis=1)], minlength=n_products)
+
+            if len(cols) <= top_k:
+                topk[cols] += b
+            else:
+                top = np.argpartition(-sub, top_k - 1, axis=1)[:, :top_k]
+                topk += np.bincount(cols[top].ravel(), minlength=n_products)
+
+    alpha = (1 - confidence) / 2
+
+    result = product_df.copy()
+    result["score_low"], result["score_high"] = np.quantile(
+        draws, [alpha, 1 - alpha], axis=0
+    )
+    result["score_se"] = draws.std(axis=0)
+    result["p_rank1"] = rank1 / n_resamples
+    result[f"p_top{top_k}"] = topk / n_resamples
+
+    return result
@@ -0,0 +1,297 @@
+"""
+Time-windowed product metrics module.
+
+Keeps per-product, per-period bucket arrays (review counts,
+rating sums, negative counts) so rolling 30/90/365-day
+metrics and recency-weighted totals come from array
+arithmetic instead of regrouping the whole corpus:
+
+- window totals use prefix sums along the time axis
+  (one subtraction per product),
+- ``rolling`` slides a window with O(1) add/subtract
+  updates per product and step,
+- ``add_reviews`` folds new reviews into existing buckets.
+
+Timestamps are Unix epoch milliseconds (as in the Amazon
+Reviews 2023 dataset). Windows are rounded up to whole
+buckets of ``WINDOW_BUCKET_DAYS``.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from src.config import WINDOW_BUCKET_DAYS, WINDOW_DAYS
+
+PROCESSED_DIR = "data/processed"
+
+MS_PER_DAY = 24 * 3600 * 1000
+
+_FIELDS = ("count", "rating_sum", "negative_count")
+
+
+class WindowedMetrics:
+    """
+    Per-product bucket arrays of shape (n_products, n_buckets).
+    """
+
+    def __init__(self, bucket_days: int = WINDOW_BUCKET_DAYS, origin_ms: int = None):
+        self.bucket_days = bucket_days
+        self.bucket_ms = bucket_days * MS_PER_DAY
+        self.origin_ms = origin_ms
+        self.asins = np.array([], dtype=object)
+        self._index = {}
+        self.arrays = {
+            field: np.zeros((0, 0), dtype=np.float64)
+            for field in _FIELDS
+        }
+        self._prefix = None
+
+    # -----------------------------
+    # Construction / updates
+    # -----------------------------
+    @classmethod
+    def from_reviews(cls, df: pd.DataFrame, bucket_days: int = WINDOW_BUCKET_DAYS):
+        """
+        Build bucket arrays from review-level data
+        (asin, rating, sentiment_label, timestamp).
+        """
+
+        metrics = cls(bucket_days)
+        metrics.add_reviews(df)
+        return metrics
+
+    @property
+    def n_products(self) -> int:
+        return self.arrays["count"].shape[0]
+
+    @property
+    def n_buckets(self) -> int:
+        return self.arrays["count"].shape[1]
+
+    def _grow(self, n_products: int, first_bucket: int, last_bucket: int) -> int:
+        """
+        Extend arrays for new products / buckets.
+
+        Returns the number of columns prepended (when reviews
+        older than the current origin arrive).
+        """
+
+        prepend = max(0, -first_bucket)
+        n_buckets = max(self.n_buckets, last_bucket + 1) + prepend
+
+        if n_products == self.n_products and n_buckets == self.n_buckets:
+            return 0
+
+        for field, array in self.arrays.items():
+            grown = np.zeros((n_products, n_buckets), dtype=array.dtype)
+            grown[:array.shape[0], prepend:prepend + array.shape[1]] = array
+            self.arrays[field] = grown
+
+        return prepend
+
+    def add_reviews(self, df: pd.DataFrame) -> None:
+        """
+        Fold a batch of reviews into the bucket arrays.
+
+        Cost is proportional to the batch, not the corpus
+        (plus an array copy when new products/periods appear).
+        """
+
+        if "timestamp" not in df.columns:
+            raise ValueError(
+                "Column 'timestamp' not found in dataset. "
+                "Re-run preprocessing so review timestamps are kept."
+            )
+
+        if df.empty:
+            return
+
+        timestamps = df["timestamp"].to_numpy(dtype=np.int64)
+
+        if self.origin_ms is None:
+            first = int(timestamps.min())
+            self.origin_ms = first - first % self.bucket_ms
+
+        buckets = (timestamps - self.origin_ms) // self.bucket_ms
+
+        # Product rows (new ASINs appended in arrival order)
+        new_asins = [
+            asin for asin in pd.unique(df["asin"])
+            if asin not in self._index
+        ]
+        for asin in new_asins:
+            self._index[asin] = len(self._index)
+        if new_asins:
+            self.asins = np.concatenate([self.asins, np.array(new_asins, dtype=object)])
+
+        rows = df["asin"].map(self._index).to_numpy(dtype=np.int64)
+
+        prepend = self._grow(len(self._index), int(buckets.min()), int(buckets.max()))
+        if prepend:
+            self.origin_ms -= prepend * self.bucket_ms
+            buckets = buckets + prepend
+
+        flat = rows * self.n_buckets + buckets
+        size = self.n_products * self.n_buckets
+
+        values = {
+            "count": None,
+            "rating_sum": df["rating"].to_numpy(dtype=np.float64),
+            "negative_count": (df["sentiment_label"] == "negative").to_numpy(dtype=np.float64),
+        }
+
+        for field, weights in values.items():
+            self.arrays[field] += np.bincount(
+                flat, weights=weights, minlength=size
+            ).reshape(self.n_products, self.n_buckets)
+
+        self._prefix = None
+
+    # -----------------------------
+    # Queries
+    # -----------------------------
+    def _buckets_for(self, days: int) -> int:
+        return max(1, int(np.ceil(days / self.bucket_days)))
+
+    def bucket_of(self, timestamp_ms: int) -> int:
+        return int((timestamp_ms - self.origin_ms) // self.bucket_ms)
+
+    def _prefix_sums(self) -> dict:
+        # Column j holds the total of buckets [0, j).
+        if self._prefix is None:
+            self._prefix = {
+                field: np.concatenate(
+                    [np.zeros((self.n_products, 1)), np.cumsum(array, axis=1)],
+                    axis=1
+                )
+                for field, array in self.arrays.items()
+            }
+        return self._prefix
+
+    def window_totals(self, days: int, as_of_ms: int = None) -> dict:
+        """
+        Per-product totals for the ``days`` ending at ``as_of_ms``
+        (default: the latest bucket).
+        """
+
+        end = self.n_buckets if as_of_ms is None else min(
+            self.n_buckets, self.bucket_of(as_of_ms) + 1
+        )
+        start = max(0, end - self._buckets_for(days))
+
+        prefix = self._prefix_sums()
+
+        return {
+            field: prefix[field][:, end] - prefix[field][:, start]
+            for field in _FIELDS
+        }
+
+    def rolling(self, days: int):
+        """
+        Slide a ``days`` window over every bucket.
+
+        Each step adds the entering bucket and subtracts the
+        leaving one (O(1) per product).
+
+        Yields:
+            (bucket_start_ms, totals dict)
+        """
+
+        width = self._buckets_for(days)
+        running = {field: np.zeros(self.n_products) for field in _FIELDS}
+
+        for t in range(self.n_buckets):
+            for field in _FIELDS:
+                running[field] += self.arrays[field][:, t]
+                if t >= width:
+                    running[field] -= self.arrays[field][:, t - width]
+
+            yield (
+                self.origin_ms + t * self.bucket_ms,
+                {field: values.copy() for field, values in running.items()}
+            )
+
+    def decayed_totals(self, half_life_days: float, as_of_ms: int = None) -> dict:
+        """
+        Exponentially recency-weighted per-product totals.
+
+        A review ``half_life_days`` older than ``as_of_ms``
+        counts half as much as a current one.
+        """
+
+        end = self.n_buckets - 1 if as_of_ms is None else self.bucket_of(as_of_ms)
+        age_days = (end - np.arange(self.n_buckets)) * self.bucket_days
+
+        weights = np.where(age_days >= 0, 0.5 ** (age_days / half_life_days), 0.0)
+
+        return {
+            field: self.arrays[field] @ weights
+            for field in _FIELDS
+        }
+
+    def window_frame(self, windows=WINDOW_DAYS, as_of_ms: int = None) -> pd.DataFrame:
+        """
+        Rolling metrics per product for each window length.
+        """
+
+        frame = pd.DataFrame({"asin": self.asins})
+
+        for days in windows:
+            totals = self.window_totals(days, as_of_ms)
+            count = totals["count"]
+
+            with np.errstate(invalid="ignore", divide="ignore"):
+                frame[f"review_count_{days}d"] = count.astype(np.int64)
+                frame[f"avg_rating_{days}d"] = np.where(
+                    count > 0, totals["rating_sum"] / count, np.nan
+                )
+                frame[f"negative_ratio_{days}d"] = np.where(
+                    count > 0, totals["negative_count"] / count, np.nan
+                )
+
+        return frame
+
+    # -----------------------------
+    # Persistence
+    # -----------------------------
+    def to_arrays(self) -> dict:
+        return {
+            "asins": self.asins.astype(str),
+            "origin_ms": np.array(self.origin_ms, dtype=np.int64),
+            "bucket_days": np.array(self.bucket_days),
+            **self.arrays,
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays) -> "WindowedMetrics":
+        metrics = cls(int(arrays["bucket_days"]), int(arrays["origin_ms"]))
+        metrics.asins = np.asarray(arrays["asins"]).astype(object)
+        metrics._index = {asin: i for i, asin in enumerate(metrics.asins)}
+        metrics.arrays = {field: np.asarray(arrays[field]) for field in _FIELDS}
+        return metrics
+
+
+def build_window_metrics(df: pd.DataFrame) -> WindowedMetrics:
+    """
+    Build bucket arrays and save rolling window metrics.
+    """
+
+    print("Building time-windowed product metrics...")
+
+    metrics = WindowedMetrics.from_reviews(df)
+
+    print(
+        f"{metrics.n_products} products × {metrics.n_buckets} "
+        f"buckets of {metrics.bucket_days} days"
+    )
+
+    os.makedirs(PROCESSED_DIR, exist_ok=True)
+
+    np.savez_compressed(f"{PROCESSED_DIR}/window_metrics.npz", **metrics.to_arrays())
+    metrics.window_frame().to_csv(f"{PROCESSED_DIR}/product_windows.csv", index=False)
+
+    print("Saved window_metrics.npz and product_windows.csv")
+
+    return metrics
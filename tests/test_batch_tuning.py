@@ -0,0 +1,74 @@
+import pytest
+
+from src import batch_tuning
+from src.batch_tuning import is_out_of_memory, run_batched
+
+CPU_OOM = RuntimeError(
+    "[enforce fail at alloc_cpu.cpp:114] data. DefaultCPUAllocator: "
+    "can't allocate memory: you tried to allocate 1073741824 bytes. "
+    "Error code 12 (Cannot allocate memory)"
+)
+CUDA_OOM = RuntimeError("CUDA out of memory. Tried to allocate 2.00 GiB")
+
+
+@pytest.mark.parametrize("error", [
+    CPU_OOM,
+    CUDA_OOM,
+    RuntimeError("DefaultCPUAllocator: not enough memory"),
+    MemoryError(),
+])
+def test_out_of_memory_errors(error):
+    assert is_out_of_memory(error)
+
+
+@pytest.mark.parametrize("error", [
+    RuntimeError("shape mismatch"),
+    ValueError("can't allocate memory"),
+])
+def test_other_errors(error):
+    assert not is_out_of_memory(error)
+
+
+def _infer_with_limit(max_batch_size, error, calls):
+    def infer(chunk, batch_size):
+        calls.append(batch_size)
+        if batch_size > max_batch_size:
+            raise error
+        return list(chunk)
+
+    return infer
+
+
+def test_backs_off_on_cpu_allocator_error(tmp_path, monkeypatch):
+    monkeypatch.setattr(batch_tuning, "_settings", {})
+    texts = [f"review {i}" for i in range(100)]
+    calls = []
+
+    results = run_batched(
+        "test",
+        _infer_with_limit(8, CPU_OOM, calls),
+        texts,
+        batch_size=32,
+        path=str(tmp_path / "batch_tuning.json")
+    )
+
+    assert [text for chunk in results for text in chunk] == texts
+    assert calls[:3] == [32, 16, 8]
+    assert set(calls[2:]) == {8}
+    assert batch_tuning.batch_settings()["test"]["backoffs"] == 2
+
+
+def test_other_errors_propagate(tmp_path, monkeypatch):
+    monkeypatch.setattr(batch_tuning, "_settings", {})
+    calls = []
+
+    with pytest.raises(RuntimeError, match="shape mismatch"):
+        run_batched(
+            "test",
+            _infer_with_limit(8, RuntimeError("shape mismatch"), calls),
+            ["review"] * 10,
+            batch_size=32,
+            path=str(tmp_path / "batch_tuning.json")
+        )
+
+    assert calls == [32]
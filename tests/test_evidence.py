@@ -0,0 +1,96 @@
+import re
+
+import pandas as pd
+import pytest
+
+from src.config import (
+    EVIDENCE_MAX_SENTENCES,
+    EVIDENCE_MAX_WORDS,
+    EVIDENCE_TOKEN_BUDGET,
+    GENERATION_MODEL,
+    PROMPT_TOKEN_BUDGET
+)
+from src.evidence import POLARITIES, estimate_tokens
+from src.generation import build_prompt
+
+LONG_WORDS = "unfortunately disconnecting intermittently overcompensating microphone".split()
+
+
+def _cluster():
+    cluster_df = pd.DataFrame({
+        "asin": [f"B0TEST{i:04d}" for i in range(5)],
+        "cluster": 0,
+        "cluster_rank": range(1, 6),
+        "final_score": [4.51234, 4.31234, 4.11234, 3.91234, 2.01234],
+        "review_count": [1234, 987, 654, 321, 111],
+        "avg_rating": [4.6, 4.4, 4.2, 4.0, 2.1],
+        "negative_ratio": [0.05, 0.08, 0.11, 0.14, 0.52],
+    })
+
+    # Longest evidence the selection stage can produce: every
+    # product and polarity spends its whole token budget.
+    words = []
+    while len(" ".join(words)) + 20 < EVIDENCE_TOKEN_BUDGET * 4 // EVIDENCE_MAX_SENTENCES:
+        words.append(LONG_WORDS[len(words) % len(LONG_WORDS)])
+    sentence = " ".join(words[:EVIDENCE_MAX_WORDS - 1]) + "."
+
+    evidence_df = pd.DataFrame([
+        {"asin": asin, "cluster": 0, "polarity": polarity, "rank": rank,
+         "sentence": f"{rank} {sentence}", "score": 1.0,
+         "tokens": estimate_tokens(f"{rank} {sentence}")}
+        for asin in cluster_df["asin"]
+        for polarity in POLARITIES
+        for rank in range(1, EVIDENCE_MAX_SENTENCES + 1)
+    ])
+    assert evidence_df.groupby(["asin", "polarity"])["tokens"].sum().max() <= EVIDENCE_TOKEN_BUDGET
+
+    return cluster_df, evidence_df
+
+
+def _word_pieces(text):
+    # Pessimistic stand-in for a subword tokenizer: every word,
+    # punctuation mark and 4-character piece of a long word.
+    return sum(
+        max(1, -(-len(token) // 4))
+        for token in re.findall(r"\w+|[^\w\s]", text)
+    )
+
+
+def _assert_fits(count_tokens):
+    cluster_df, evidence_df = _cluster()
+
+    prompt = build_prompt(0, cluster_df, evidence_df, count_tokens)
+    unbounded = build_prompt(0, cluster_df, evidence_df, count_tokens, budget=10 ** 9)
+
+    assert count_tokens(unbounded) > PROMPT_TOKEN_BUDGET
+    assert count_tokens(prompt) <= PROMPT_TOKEN_BUDGET
+    assert prompt.endswith("Generate the full report now.")
+    assert '+ "1 ' in prompt and '- "1 ' in prompt
+
+
+def test_longest_prompt_fits_budget():
+    _assert_fits(_word_pieces)
+
+
+def test_longest_prompt_fits_generator_tokenizer():
+    transformers = pytest.importorskip("transformers")
+
+    try:
+        tokenizer = transformers.AutoTokenizer.from_pretrained(GENERATION_MODEL)
+    except OSError:
+        pytest.skip(f"{GENERATION_MODEL} tokenizer not available offline")
+
+    _assert_fits(lambda text: len(tokenizer(text).input_ids))
+
+
+def test_prompt_without_evidence_has_no_quotes():
+    cluster_df, evidence_df = _cluster()
+
+    baseline = build_prompt(0, cluster_df)
+
+    assert '"' not in baseline
+    assert "Quoted lines" not in baseline
+
+    # Budget below the bare prompt: fall back to no evidence
+    tight = build_prompt(0, cluster_df, evidence_df, _word_pieces, budget=10)
+    assert tight == baseline
@@ -0,0 +1,59 @@
+import os
+
+import pandas as pd
+import pytest
+
+import src.config as config
+from src import pipeline
+from src.pipeline import Stage, run_pipeline
+
+
+def _run_toy(store):
+    df = pd.DataFrame({"value": [config.RANDOM_STATE] * 3})
+    df.to_csv(pipeline.artifact_path("toy.csv"), index=False)
+    return {"toy.csv": df}
+
+
+@pytest.fixture
+def toy_pipeline(tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / ".pipeline_cache")
+    stage = Stage("toy", _run_toy, outputs=("toy.csv",), config_keys=("RANDOM_STATE",))
+
+    monkeypatch.setattr(pipeline, "PROCESSED_DIR", str(tmp_path))
+    monkeypatch.setattr(pipeline, "CACHE_DIR", cache_dir)
+    monkeypatch.setattr(pipeline, "MANIFEST_PATH", os.path.join(cache_dir, "manifest.json"))
+    monkeypatch.setattr(pipeline, "STAGES", [stage])
+    monkeypatch.setattr(pipeline, "STAGE_NAMES", ["toy"])
+
+    return os.path.join(cache_dir, "objects")
+
+
+def _run(monkeypatch, seed):
+    monkeypatch.setattr(config, "RANDOM_STATE", seed)
+    [result] = run_pipeline(stages=["toy"])
+    return result
+
+
+def test_cache_keeps_recent_versions_per_stage(toy_pipeline, monkeypatch):
+    monkeypatch.setattr(config, "PIPELINE_CACHE_KEEP", 2)
+
+    fingerprints = [_run(monkeypatch, seed).fingerprint for seed in (1, 2, 3)]
+
+    manifest = pipeline.load_manifest()
+    assert sorted(os.listdir(toy_pipeline)) == sorted(fingerprints[1:])
+    assert sorted(manifest["objects"]) == sorted(fingerprints[1:])
+    assert manifest["stages"]["toy"]["history"] == fingerprints[:0:-1]
+
+    # Previous version is restored from the cache, the pruned one re-runs
+    assert _run(monkeypatch, 2).status == "restored"
+    assert _run(monkeypatch, 1).status == "ran"
+    assert sorted(os.listdir(toy_pipeline)) == sorted([fingerprints[0], fingerprints[1]])
+
+
+def test_cache_prunes_unreferenced_objects(toy_pipeline, monkeypatch):
+    _run(monkeypatch, 1)
+    os.makedirs(os.path.join(toy_pipeline, "orphan"))
+
+    _run(monkeypatch, 1)
+
+    assert "orphan" not in os.listdir(toy_pipeline)
@@ -0,0 +1,24 @@
+from reportlab.lib.styles import getSampleStyleSheet
+
+from src.report_pdf import _paragraph, render_report_pdf
+
+REPORT = """### Section 1: Overview
+**bold *mixed** text*
+
+- Battery: **great *value** overall*
+- Plain <b> & tags stay literal
+"""
+
+
+def test_badly_nested_markdown_renders():
+    pdf = render_report_pdf(0, [], REPORT)
+
+    assert pdf.startswith(b"%PDF")
+
+
+def test_badly_nested_markdown_falls_back_to_plain_text():
+    style = getSampleStyleSheet()["BodyText"]
+
+    assert _paragraph("**bold *mixed** text*", style).getPlainText() == "**bold *mixed** text*"
+    assert _paragraph("**bold** and *italic*", style).getPlainText() == "bold and italic"
+    assert _paragraph("a <b> & c", style).getPlainText() == "a <b> & c"
@@ -0,0 +1,43 @@
+import pandas as pd
+import pytest
+
+from src.review_search import build_review_index, count_matches, open_index, search_reviews
+
+
+@pytest.fixture
+def review_index(tmp_path):
+    review_df = pd.DataFrame({
+        "asin": ["A", "A", "B", "B"],
+        "rating": [1.0, 5.0, 2.0, 4.0],
+        "sentiment_label": ["negative", "positive", "negative", "positive"],
+        "title": ["Broke", "Great", "Meh", "Good"],
+        "timestamp": [1, 2, 3, 4],
+        "text": [
+            "The battery died after a week.",
+            "Great sound and battery life!",
+            "Bass is muddy.",
+            "Clear sound, good bass.",
+        ],
+    })
+    cluster_df = pd.DataFrame({"asin": ["A", "B"], "cluster": [0, 0]})
+
+    path = str(tmp_path / "review_index.db")
+    build_review_index(review_df, cluster_df, path)
+    conn = open_index(path)
+    yield conn
+    conn.close()
+
+
+@pytest.mark.parametrize("query", ["", "   ", "!!!", "?", '"!!!"'])
+def test_query_without_words_matches_nothing(review_index, query):
+    filters = dict(cluster=0, sentiment="negative")
+
+    assert search_reviews(review_index, query, **filters).empty
+    assert count_matches(review_index, query, **filters) == 0
+
+
+def test_filtered_search(review_index):
+    results = search_reviews(review_index, "battery!", cluster=0, sentiment="negative")
+
+    assert results["asin"].tolist() == ["A"]
+    assert count_matches(review_index, "battery", cluster=0) == 2
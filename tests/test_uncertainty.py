@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+
+from src.uncertainty import bootstrap_scores, review_category_counts
+
+PRIOR_STRENGTH = 5.0
+PRIOR_MEAN = 4.0
+
+
+def _draws(reviews, asins, n_resamples=200):
+    review_df = pd.DataFrame(reviews, columns=["asin", "rating", "sentiment_label"])
+    counts, category_rating, category_negative = review_category_counts(review_df, asins)
+
+    return np.concatenate(list(bootstrap_scores(
+        counts,
+        category_rating,
+        category_negative,
+        PRIOR_STRENGTH,
+        PRIOR_MEAN,
+        n_resamples,
+        seed=0
+    )))
+
+
+def test_all_negative_reviews_score_zero():
+    # Every category is negative: each resample is all negative,
+    # so the sentiment penalty zeroes every score.
+    reviews = [("A", 1.0, "negative")] * 3 + [("B", 2.0, "negative")] * 4 + [("B", 1.0, "negative")]
+
+    draws = _draws(reviews, ["A", "B"])
+
+    assert np.all(draws == 0)
+
+
+def test_all_positive_constant_rating():
+    reviews = [("A", 5.0, "positive")] * 4 + [("B", 4.0, "positive")] * 7
+
+    draws = _draws(reviews, ["A", "B"])
+
+    expected_a = (4 * 5.0 + PRIOR_STRENGTH * PRIOR_MEAN) / (4 + PRIOR_STRENGTH)
+    expected_b = (7 * 4.0 + PRIOR_STRENGTH * PRIOR_MEAN) / (7 + PRIOR_STRENGTH)
+    np.testing.assert_allclose(draws[:, 0], expected_a, rtol=1e-6)
+    np.testing.assert_allclose(draws[:, 1], expected_b, rtol=1e-6)
+
+
+def test_mixed_reviews_negative_share():
+    # One negative (1 star) and one positive (5 star) review:
+    # a resample has 0, 1 or 2 negatives.
+    reviews = [("A", 1.0, "negative"), ("A", 5.0, "positive")]
+
+    draws = _draws(reviews, ["A"], n_resamples=2000)[:, 0]
+
+    def score(negatives):
+        rating_sum = negatives * 1.0 + (2 - negatives) * 5.0
+        bayesian = (rating_sum + PRIOR_STRENGTH * PRIOR_MEAN) / (2 + PRIOR_STRENGTH)
+        return bayesian * (1 - negatives / 2)
+
+    np.testing.assert_allclose(
+        np.unique(draws),
+        sorted({score(0), score(1), score(2)}),
+        rtol=1e-6
+    )
+    assert abs(np.mean(draws == 0) - 0.25) < 0.05
+
+
+def test_product_without_reviews_scores_prior():
+    reviews = [("A", 5.0, "positive"), ("A", 3.0, "positive"), ("A", 1.0, "negative")]
+
+    draws = _draws(reviews, ["A", "B"])
+
+    np.testing.assert_allclose(draws[:, 1], PRIOR_MEAN, rtol=1e-6)